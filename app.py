@@ -1,20 +1,24 @@
 # site agente novelties
 import streamlit as st
 import asyncio
-import time
 import os
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 import tempfile
 import json
 import threading
+from concurrent.futures import ThreadPoolExecutor, Future
 import logging
-import glob
 import shutil
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
-# Configuração de logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Configuração de logging (WARNING por padrão; use LOG_LEVEL=INFO ou DEBUG para mais detalhes)
+# Um LOG_LEVEL inválido volta para WARNING em vez de impedir a inicialização
+LOG_LEVEL = getattr(logging, os.environ.get('LOG_LEVEL', 'WARNING').upper(), None)
+if not isinstance(LOG_LEVEL, int):
+    LOG_LEVEL = logging.WARNING
+logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Configurar logs para também serem mostrados na interface
@@ -30,14 +34,19 @@ class StreamlitHandler(logging.Handler):
         if len(self.logs) > 100:
             self.logs.pop(0)
 
-# Criar handler para logs do Streamlit
-streamlit_handler = StreamlitHandler()
-streamlit_handler.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-streamlit_handler.setFormatter(formatter)
-logger.addHandler(streamlit_handler)
+# Criar handler para logs do Streamlit uma única vez por processo
+# (o script é reexecutado a cada rerun e adicionaria um novo handler ao mesmo logger)
+@st.cache_resource
+def get_streamlit_handler() -> StreamlitHandler:
+    handler = StreamlitHandler()
+    handler.setLevel(logging.INFO)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    return handler
 
-logger.info("Iniciando app.py")
+streamlit_handler = get_streamlit_handler()
+
+logger.debug("Iniciando app.py")
 
 try:
     # Configuração inicial do Streamlit
@@ -47,26 +56,107 @@ try:
         layout="wide"
     )
     
-    logger.info("Configuração do Streamlit inicializada")
-except Exception as e:
-    logger.error(f"Erro ao configurar Streamlit: {e}")
+    logger.debug("Configuração do Streamlit inicializada")
+except Exception:
+    logger.exception("Erro ao configurar Streamlit")
 
 # IMPORTANTE: bloco removido para evitar conflito com o healthcheck separado
 # Não tente inicializar o healthcheck aqui, pois agora ele é executado como processo separado
 
+# Quantidade de tarefas exibidas por página na lista de tarefas
+TASKS_PAGE_SIZE = 25
+
+# Provedores exibidos na página de configuração: (provedor, rótulo)
+API_KEY_PROVIDERS = [
+    ('openai', 'OpenAI'),
+    ('anthropic', 'Anthropic'),
+    ('azure', 'Azure OpenAI'),
+    ('gemini', 'Gemini'),
+    ('deepseek', 'DeepSeek'),
+    ('ollama', 'Ollama')
+]
+
+# Título exibido no menu lateral
+_SIDEBAR_TITLE = "🤖 Gerenciador de Agentes IA"
+
+# Opções do menu de navegação (a página de detalhes só aparece com uma tarefa selecionada)
+_BASE_NAV = ("Configuração", "Criar Tarefa", "Minhas Tarefas")
+_NAV_WITH_TASK = _BASE_NAV + ("Detalhes da Tarefa",)
+
+# Nomes exibidos no seletor de provedor de LLM
+LLM_PROVIDER_LABELS = {
+    'openai': 'OpenAI',
+    'anthropic': 'Anthropic',
+    'azure': 'Azure OpenAI',
+    'gemini': 'Google Gemini',
+    'deepseek': 'DeepSeek',
+    'ollama': 'Ollama (Local)'
+}
+LLM_PROVIDERS = tuple(LLM_PROVIDER_LABELS)
+LLM_PROVIDER_INDEX = {provider: i for i, provider in enumerate(LLM_PROVIDERS)}
+
+# Valores iniciais (imutáveis) do estado da sessão
+SESSION_DEFAULTS = {
+    'current_task': None,
+    'llm_provider': "openai",
+    'llm_model': "gpt-4o",
+    'screenshot_index': 0,
+    'confirm_delete_all': False,
+    'delete_message': None
+}
+
+# Configuração padrão do navegador (somente leitura; cada sessão recebe a sua cópia)
+DEFAULT_BROWSER_CONFIG = MappingProxyType({
+    'headless': False,  # Mudado para False para visualizar o navegador
+    'disable_security': True,
+    'browser_window_width': 1280,
+    'browser_window_height': 1100,
+    'highlight_elements': True,
+    'chrome_instance_path': None,
+    'wait_for_network_idle': 3.0,
+    'minimum_wait_page_load_time': 0.5,
+    'maximum_wait_page_load_time': 5.0,
+    'max_steps': 15,
+    'full_page_screenshot': False,
+    'use_vision': True,
+    'save_recording': True,
+    'recording_path': 'static/recordings',
+    'show_browser': True
+})
+
+# Número máximo de tarefas executadas simultaneamente pelo processo
+TASK_EXECUTOR_WORKERS = int(os.environ.get('TASK_EXECUTOR_WORKERS', 4))
+
 # Importações internas
 try:
-    logger.info("Importando módulos internos")
+    logger.debug("Importando módulos internos")
     from db.database import init_db, get_db_session
     from db.models import Task, TaskHistory, ApiKey
-    from utils.agent_runner import run_agent_task
+    from sqlalchemy import update, delete, bindparam, and_, or_
+    from sqlalchemy.orm import joinedload
     from utils.helpers import format_datetime, get_status_color, generate_unique_id, get_llm_models
-    from utils.sensitive_data import sensitive_data_manager
-    from utils.controller import controller, ActionResult
-    from utils.output_format import output_format_manager
-    logger.info("Módulos internos importados com sucesso")
+    from utils import task_queue
+    from utils.task_runner import upsert_rows, store_execution_params, execute_task_async, fail_task
+    from utils.maintenance import MaintenanceManager
+    from utils.db_migration import run_migration
+    
+    # Instruções de atualização de status montadas uma única vez e reaproveitadas por todas as tarefas
+    # Transição atômica para 'running': apenas uma execução consegue reivindicar a tarefa
+    _CLAIM_TASK = (
+        update(Task)
+        .where(
+            Task.id == bindparam('task_id_param'),
+            or_(
+                Task.status.in_(bindparam('claimable_statuses', expanding=True)),
+                # Execuções iniciadas há mais de 30 minutos provavelmente travaram
+                and_(Task.status == 'running', Task.started_at < bindparam('stuck_before'))
+            )
+        )
+        .values(status='running', started_at=bindparam('started_at'))
+    )
+    logger.debug("Módulos internos importados com sucesso")
 except ImportError as e:
-    logger.error(f"Erro ao importar módulos: {e}")
+    logger.exception("Erro ao importar módulos")
     st.error(f"Erro ao importar módulos: {e}")
 
 async def test_browser_visibility():
@@ -96,217 +186,211 @@ async def test_browser_visibility():
     except Exception as e:
         return False, f"Erro ao iniciar navegador: {str(e)}"
 
+def _remove_task_files(task_ids=None):
+    """Remove screenshots e gravações das tarefas (de todas, se task_ids for None) com uma única leitura por diretório"""
+    task_ids = set(task_ids) if task_ids is not None else None
+    
+    # Remover screenshots ({task_id}_*.png)
+    try:
+        with os.scandir("static/screenshots") as entries:
+            for entry in entries:
+                if entry.name.endswith(".png") and (task_ids is None or entry.name.partition("_")[0] in task_ids):
+                    os.remove(entry.path)
+    except FileNotFoundError:
+        pass
+    
+    # Remover gravações ({task_id}.webm)
+    if task_ids is None:
+        try:
+            with os.scandir("static/recordings") as entries:
+                for entry in entries:
+                    if entry.name.endswith(".webm"):
+                        os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+        return
+    
+    for task_id in task_ids:
+        recording_path = f"static/recordings/{task_id}.webm"
+        if os.path.exists(recording_path):
+            os.remove(recording_path)
+
+def _delete_task_rows(session, task_ids):
+    """Exclui tarefas e históricos com DELETE direto, sem carregar os objetos; retorna o número de tarefas excluídas"""
+    # O histórico é excluído explicitamente porque a cascata do ORM não se aplica a DELETEs em lote
+    session.execute(delete(TaskHistory).where(TaskHistory.task_id.in_(task_ids)))
+    return session.execute(delete(Task).where(Task.id.in_(task_ids))).rowcount
+
 def delete_task(task_id):
     """Deleta uma tarefa e seu histórico do banco de dados"""
-    logger.info(f"Tentando deletar tarefa {task_id}")
+    logger.info("Tentando deletar tarefa %s", task_id)
     
     try:
         with get_db_session() as session:
-            # Buscar a tarefa (o relacionamento em cascata irá excluir o histórico automaticamente)
-            task = session.query(Task).filter(Task.id == task_id).first()
-            
-            if not task:
-                logger.warning(f"Tarefa {task_id} não encontrada para exclusão")
+            if not _delete_task_rows(session, [task_id]):
+                session.rollback()
+                logger.warning("Tarefa %s não encontrada para exclusão", task_id)
                 return False, "Tarefa não encontrada"
             
-            # Excluir a tarefa
-            session.delete(task)
             session.commit()
             
             # Tentar excluir screenshots e gravação
             try:
-                # Remover screenshots
-                screenshot_pattern = f"static/screenshots/{task_id}_*.png"
-                for screenshot in glob.glob(screenshot_pattern):
-                    os.remove(screenshot)
-                
-                # Remover gravação
-                recording_path = f"static/recordings/{task_id}.webm"
-                if os.path.exists(recording_path):
-                    os.remove(recording_path)
+                _remove_task_files([task_id])
             except Exception as e:
-                logger.warning(f"Erro ao remover arquivos da tarefa {task_id}: {str(e)}")
+                logger.warning("Erro ao remover arquivos da tarefa %s: %s", task_id, e)
             
-            logger.info(f"Tarefa {task_id} deletada com sucesso")
+            logger.info("Tarefa %s deletada com sucesso", task_id)
             return True, "Tarefa deletada com sucesso"
     
     except Exception as e:
-        logger.error(f"Erro ao deletar tarefa {task_id}: {str(e)}")
+        logger.exception("Erro ao deletar tarefa %s", task_id)
         return False, f"Erro ao deletar tarefa: {str(e)}"
 
+def delete_all_tasks():
+    """Deleta todas as tarefas e remove seus arquivos com uma única varredura dos diretórios"""
+    logger.info("Tentando deletar todas as tarefas")
+    
+    try:
+        # DELETEs sem filtro na mesma transação: sem lista IN com todos os IDs
+        with get_db_session() as session:
+            session.execute(delete(TaskHistory))
+            deleted = session.execute(delete(Task)).rowcount
+            session.commit()
+        
+        try:
+            _remove_task_files()
+        except Exception as e:
+            logger.warning("Erro ao remover arquivos das tarefas: %s", e)
+        
+        logger.info("%s tarefas deletadas com sucesso", deleted)
+        return True, f"Todas as {deleted} tarefas foram deletadas com sucesso!"
+    
+    except Exception as e:
+        logger.exception("Erro ao deletar todas as tarefas")
+        return False, f"Erro ao deletar tarefas: {str(e)}"
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_api_keys() -> Dict[str, Any]:
+    """Carrega as chaves de API do banco de dados (em cache entre reruns)"""
+    with get_db_session() as session:
+        api_keys = dict(session.query(ApiKey.provider, ApiKey.api_key).all())
+    
+    # A configuração do navegador fica na mesma tabela; decodificar o JSON uma única vez
+    if api_keys.get('browser_config'):
+        try:
+            browser_config = json.loads(api_keys['browser_config'])
+        except ValueError:
+            browser_config = None
+        
+        # A sessão guarda sempre o dicionário já decodificado, nunca a string JSON
+        if isinstance(browser_config, dict):
+            api_keys['browser_config_parsed'] = browser_config
+        else:
+            logger.warning("Configuração do navegador salva no banco de dados é inválida")
+    
+    return api_keys
+
+def upsert_api_keys(keys: Dict[str, Optional[str]]):
+    """Salva várias chaves de API com uma única instrução de upsert"""
+    if not keys:
+        return
+    
+    rows = [{'provider': provider, 'api_key': value} for provider, value in keys.items()]
+    
+    with get_db_session() as session:
+        upsert_rows(session, ApiKey, rows, 'provider')
+        session.commit()
+    
+    # Invalidar o cache para que a próxima leitura reflita a gravação
+    load_api_keys.clear()
+
 # Inicialização de variáveis de sessão
 def init_session_state():
     """Inicializa variáveis de estado da sessão"""
     try:
-        logger.info("Inicializando estado da sessão")
-        if 'db_initialized' not in st.session_state:
-            st.session_state.db_initialized = False
-        if 'current_task' not in st.session_state:
-            st.session_state.current_task = None
-        if 'llm_provider' not in st.session_state:
-            st.session_state.llm_provider = "openai"
-        if 'llm_model' not in st.session_state:
-            st.session_state.llm_model = "gpt-4o"
+        logger.debug("Inicializando estado da sessão")
+        for key, default in SESSION_DEFAULTS.items():
+            st.session_state.setdefault(key, default)
+        
+        # Valores padrão que dependem do banco de dados ou de IDs gerados são criados apenas quando ausentes
         if 'browser_config' not in st.session_state:
-            # Carregar config do banco de dados ou usar padrão
-            st.session_state.browser_config = {
-                'headless': False,  # Mudado para False para visualizar o navegador
-                'disable_security': True,
-                'browser_window_width': 1280,
-                'browser_window_height': 1100,
-                'highlight_elements': True,
-                'chrome_instance_path': None,
-                'wait_for_network_idle': 3.0,
-                'minimum_wait_page_load_time': 0.5,
-                'maximum_wait_page_load_time': 5.0,
-                'max_steps': 15,
-                'full_page_screenshot': False,
-                'use_vision': True,
-                'save_recording': True,
-                'recording_path': 'static/recordings',
-                'show_browser': True
-            }
-        if 'task_running' not in st.session_state:
-            st.session_state.task_running = False
-        if 'task_result' not in st.session_state:
-            st.session_state.task_result = None
-        if 'screenshot_index' not in st.session_state:
-            st.session_state.screenshot_index = 0
-        if 'confirm_delete_all' not in st.session_state:
-            st.session_state.confirm_delete_all = False
-        if 'delete_message' not in st.session_state:
-            st.session_state.delete_message = None
+            # Carregar config do banco de dados (já decodificada e em cache) ou usar padrão
+            saved_config = load_api_keys().get('browser_config_parsed')
+            st.session_state.browser_config = dict(DEFAULT_BROWSER_CONFIG, **(saved_config or {}))
         if 'sensitive_data_entries' not in st.session_state:
-            st.session_state.sensitive_data_entries = [("x_username", ""), ("x_password", "")]
-        if 'force_rerun_task' not in st.session_state:
-            st.session_state.force_rerun_task = False
-        logger.info("Estado da sessão inicializado com sucesso")
-    except Exception as e:
-        logger.error(f"Erro ao inicializar estado da sessão: {e}")
+            # Entradas indexadas por um ID estável, usado também nas chaves dos widgets
+            st.session_state.sensitive_data_entries = {
+                generate_unique_id(): ("x_username", ""),
+                generate_unique_id(): ("x_password", "")
+            }
+        logger.debug("Estado da sessão inicializado com sucesso")
+    except Exception:
+        logger.exception("Erro ao inicializar estado da sessão")
 
 # Interface Streamlit
+def render_provider_tab(provider, label, api_keys):
+    """Renderiza a aba de configuração de um provedor e retorna os valores informados"""
+    st.markdown(f"### Configuração {label}")
+    
+    if provider == 'ollama':
+        st.info("Ollama é executado localmente e não requer chave API. Certifique-se de que o Ollama esteja instalado e em execução no servidor.")
+        return {}
+    
+    values = {}
+    if provider == 'azure':
+        values['azure_endpoint'] = st.text_input(
+            "Azure OpenAI Endpoint", 
+            value=api_keys.get('azure_endpoint', '')
+        )
+        values['azure'] = st.text_input(
+            "Azure OpenAI Key", 
+            type="password", 
+            value=api_keys.get('azure', '')
+        )
+        button_label = "Salvar Configuração Azure"
+        success_message = "Configuração Azure OpenAI salva com sucesso!"
+    else:
+        values[provider] = st.text_input(
+            f"API Key {label}", 
+            type="password", 
+            value=api_keys.get(provider, '')
+        )
+        button_label = f"Salvar Chave {label}"
+        success_message = f"Chave API {label} salva com sucesso!"
+    
+    if st.button(button_label):
+        upsert_api_keys(values)
+        st.success(success_message)
+    
+    return values
+
+@st.fragment
 def auth_page():
     """Página de configuração das chaves de API"""
     try:
-        logger.info("Carregando página de configuração")
+        logger.debug("Carregando página de configuração")
         st.title("🔐 Configuração das APIs")
         
-        # Obter chaves atuais do banco de dados
-        with get_db_session() as session:
-            api_keys = {key.provider: key.api_key for key in session.query(ApiKey).all()}
-            azure_endpoint = api_keys.get('azure_endpoint', '')
-        
-        tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-            "OpenAI", "Anthropic", "Azure OpenAI", "Gemini", "DeepSeek", "Ollama"
-        ])
-        
-        with tab1:
-            st.markdown("### Configuração OpenAI")
-            openai_api_key = st.text_input(
-                "API Key OpenAI", 
-                type="password", 
-                value=api_keys.get('openai', '')
-            )
-            if st.button("Salvar Chave OpenAI"):
-                with get_db_session() as session:
-                    key = session.query(ApiKey).filter(ApiKey.provider == 'openai').first()
-                    if key:
-                        key.api_key = openai_api_key
-                    else:
-                        key = ApiKey(provider='openai', api_key=openai_api_key)
-                        session.add(key)
-                    session.commit()
-                st.success("Chave API OpenAI salva com sucesso!")
-        
-        with tab2:
-            st.markdown("### Configuração Anthropic")
-            anthropic_api_key = st.text_input(
-                "API Key Anthropic", 
-                type="password", 
-                value=api_keys.get('anthropic', '')
-            )
-            if st.button("Salvar Chave Anthropic"):
-                with get_db_session() as session:
-                    key = session.query(ApiKey).filter(ApiKey.provider == 'anthropic').first()
-                    if key:
-                        key.api_key = anthropic_api_key
-                    else:
-                        key = ApiKey(provider='anthropic', api_key=anthropic_api_key)
-                        session.add(key)
-                    session.commit()
-                st.success("Chave API Anthropic salva com sucesso!")
-        
-        with tab3:
-            st.markdown("### Configuração Azure OpenAI")
-            azure_openai_endpoint = st.text_input(
-                "Azure OpenAI Endpoint", 
-                value=azure_endpoint
-            )
-            azure_openai_key = st.text_input(
-                "Azure OpenAI Key", 
-                type="password", 
-                value=api_keys.get('azure', '')
-            )
-            if st.button("Salvar Configuração Azure"):
-                with get_db_session() as session:
-                    # Salvar endpoint
-                    endpoint_key = session.query(ApiKey).filter(ApiKey.provider == 'azure_endpoint').first()
-                    if endpoint_key:
-                        endpoint_key.api_key = azure_openai_endpoint
-                    else:
-                        endpoint_key = ApiKey(provider='azure_endpoint', api_key=azure_openai_endpoint)
-                        session.add(endpoint_key)
-                    
-                    # Salvar chave
-                    key = session.query(ApiKey).filter(ApiKey.provider == 'azure').first()
-                    if key:
-                        key.api_key = azure_openai_key
-                    else:
-                        key = ApiKey(provider='azure', api_key=azure_openai_key)
-                        session.add(key)
-                    
-                    session.commit()
-                st.success("Configuração Azure OpenAI salva com sucesso!")
+        # Obter chaves atuais (em cache)
+        api_keys = load_api_keys()
         
-        with tab4:
-            st.markdown("### Configuração Gemini")
-            gemini_api_key = st.text_input(
-                "API Key Gemini", 
-                type="password", 
-                value=api_keys.get('gemini', '')
-            )
-            if st.button("Salvar Chave Gemini"):
-                with get_db_session() as session:
-                    key = session.query(ApiKey).filter(ApiKey.provider == 'gemini').first()
-                    if key:
-                        key.api_key = gemini_api_key
-                    else:
-                        key = ApiKey(provider='gemini', api_key=gemini_api_key)
-                        session.add(key)
-                    session.commit()
-                st.success("Chave API Gemini salva com sucesso!")
+        tabs = st.tabs([label for _, label in API_KEY_PROVIDERS])
         
-        with tab5:
-            st.markdown("### Configuração DeepSeek")
-            deepseek_api_key = st.text_input(
-                "API Key DeepSeek", 
-                type="password", 
-                value=api_keys.get('deepseek', '')
-            )
-            if st.button("Salvar Chave DeepSeek"):
-                with get_db_session() as session:
-                    key = session.query(ApiKey).filter(ApiKey.provider == 'deepseek').first()
-                    if key:
-                        key.api_key = deepseek_api_key
-                    else:
-                        key = ApiKey(provider='deepseek', api_key=deepseek_api_key)
-                        session.add(key)
-                    session.commit()
-                st.success("Chave API DeepSeek salva com sucesso!")
+        entered_keys = {}
+        for tab, (provider, label) in zip(tabs, API_KEY_PROVIDERS):
+            with tab:
+                entered_keys.update(render_provider_tab(provider, label, api_keys))
         
-        with tab6:
-            st.markdown("### Configuração Ollama")
-            st.info("Ollama é executado localmente e não requer chave API. Certifique-se de que o Ollama esteja instalado e em execução no servidor.")
+        # Salvar de uma vez todas as chaves alteradas
+        changed_keys = {
+            provider: value 
+            for provider, value in entered_keys.items() 
+            if value != api_keys.get(provider, '')
+        }
+        if st.button("Salvar Todas as Chaves Alteradas", disabled=not changed_keys):
+            upsert_api_keys(changed_keys)
+            st.success(f"{len(changed_keys)} configuração(ões) salva(s) com sucesso!")
         
         st.divider()
         
@@ -365,30 +449,49 @@ def auth_page():
             st.session_state.browser_config = browser_config
             
             # Salvar no banco de dados como JSON
-            with get_db_session() as session:
-                key = session.query(ApiKey).filter(ApiKey.provider == 'browser_config').first()
-                if key:
-                    key.api_key = json.dumps(browser_config)
-                else:
-                    key = ApiKey(provider='browser_config', api_key=json.dumps(browser_config))
-                    session.add(key)
-                session.commit()
+            upsert_api_keys({'browser_config': json.dumps(browser_config, separators=(',', ':'))})
             
             st.success("Configurações do navegador salvas com sucesso!")
-        logger.info("Página de configuração carregada com sucesso")
+        logger.debug("Página de configuração carregada com sucesso")
     except Exception as e:
-        logger.error(f"Erro ao carregar página de configuração: {e}")
+        logger.exception("Erro ao carregar página de configuração")
         st.error(f"Erro ao carregar página de configuração: {e}")
 
+def _update_browser_option(option):
+    """Grava no browser_config da sessão a opção alterada em um widget de configuração do navegador"""
+    value = st.session_state[f"cfg_{option}"]
+    st.session_state.browser_config[option] = value
+    # headless e show_browser são sempre opostos
+    if option == 'show_browser':
+        st.session_state.browser_config['headless'] = not value
+    elif option == 'headless':
+        st.session_state.browser_config['show_browser'] = not value
+
+def _add_sensitive_entry():
+    """Adiciona uma nova entrada de dado sensível"""
+    entries = st.session_state.sensitive_data_entries
+    entries[generate_unique_id()] = (f"x_data_{len(entries) + 1}", "")
+
+def _remove_sensitive_entry(entry_id):
+    """Remove uma entrada de dado sensível"""
+    st.session_state.sensitive_data_entries.pop(entry_id, None)
+
+def _update_sensitive_entry(entry_id):
+    """Copia para a entrada os valores editados nos campos de placeholder e valor"""
+    st.session_state.sensitive_data_entries[entry_id] = (
+        st.session_state[f"placeholder_{entry_id}"],
+        st.session_state[f"value_{entry_id}"]
+    )
+
+@st.fragment
 def create_task_page():
     """Página para criar novas tarefas"""
     try:
-        logger.info("Carregando página de criação de tarefas")
+        logger.debug("Carregando página de criação de tarefas")
         st.title("🚀 Criar Nova Tarefa")
         
-        # Obter chaves do banco de dados
-        with get_db_session() as session:
-            api_keys = {key.provider: key.api_key for key in session.query(ApiKey).all()}
+        # Obter chaves (em cache)
+        api_keys = load_api_keys()
         
         col1, col2 = st.columns([3, 1])
         
@@ -405,16 +508,9 @@ def create_task_page():
             with model_col1:
                 llm_provider = st.selectbox(
                     "Provedor de LLM",
-                    options=["openai", "anthropic", "azure", "gemini", "deepseek", "ollama"],
-                    index=["openai", "anthropic", "azure", "gemini", "deepseek", "ollama"].index(st.session_state.llm_provider),
-                    format_func=lambda x: {
-                        'openai': 'OpenAI',
-                        'anthropic': 'Anthropic',
-                        'azure': 'Azure OpenAI',
-                        'gemini': 'Google Gemini',
-                        'deepseek': 'DeepSeek',
-                        'ollama': 'Ollama (Local)'
-                    }.get(x, x)
+                    options=LLM_PROVIDERS,
+                    index=LLM_PROVIDER_INDEX.get(st.session_state.llm_provider, 0),
+                    format_func=LLM_PROVIDER_LABELS.get
                 )
                 st.session_state.llm_provider = llm_provider
             
@@ -431,50 +527,42 @@ def create_task_page():
             with st.expander("🔧 Opções avançadas do navegador"):
                 col1, col2 = st.columns(2)
                 
+                # Cada widget atualiza apenas a sua opção no browser_config da sessão quando alterado
                 with col1:
-                    show_browser = st.checkbox(
+                    st.checkbox(
                         "Mostrar navegador durante execução", 
                         value=st.session_state.browser_config.get('show_browser', True),
-                        help="Se marcado, você verá o navegador em tempo real durante a execução da tarefa."
+                        help="Se marcado, você verá o navegador em tempo real durante a execução da tarefa.",
+                        key="cfg_show_browser",
+                        on_change=_update_browser_option, args=('show_browser',)
                     )
                     
-                    headless = not show_browser  # Inverso do show_browser
-                    
-                    save_recording = st.checkbox(
+                    st.checkbox(
                         "Salvar gravação da execução", 
                         value=st.session_state.browser_config.get('save_recording', True),
-                        help="Se marcado, uma gravação da execução será salva e poderá ser visualizada depois."
+                        help="Se marcado, uma gravação da execução será salva e poderá ser visualizada depois.",
+                        key="cfg_save_recording",
+                        on_change=_update_browser_option, args=('save_recording',)
                     )
                 
                 with col2:
-                    max_steps = st.number_input(
+                    st.number_input(
                         "Número máximo de passos", 
                         min_value=5, 
                         max_value=50, 
                         value=st.session_state.browser_config.get('max_steps', 15),
-                        help="Limita o número máximo de ações que o agente pode executar."
+                        help="Limita o número máximo de ações que o agente pode executar.",
+                        key="cfg_max_steps",
+                        on_change=_update_browser_option, args=('max_steps',)
                     )
                     
-                    highlight_elements = st.checkbox(
+                    st.checkbox(
                         "Destacar elementos interativos", 
                         value=st.session_state.browser_config.get('highlight_elements', True),
-                        help="Destaca elementos quando o agente interage com eles."
+                        help="Destaca elementos quando o agente interage com eles.",
+                        key="cfg_highlight_elements",
+                        on_change=_update_browser_option, args=('highlight_elements',)
                     )
-                
-                # Atualizar configuração do navegador
-                browser_config = st.session_state.browser_config.copy()
-                browser_config.update({
-                    'headless': headless,
-                    'show_browser': not headless,  # Sempre o oposto de headless
-                    'save_recording': save_recording,
-                    'max_steps': max_steps,
-                    'highlight_elements': highlight_elements,
-                    'recording_path': 'static/recordings'
-                })
-                
-                # Atualizar sessão apenas quando necessário
-                if browser_config != st.session_state.browser_config:
-                    st.session_state.browser_config = browser_config
 
             # Dados sensíveis
             with st.expander("🔒 Dados Sensíveis"):
@@ -483,46 +571,29 @@ def create_task_page():
                 O agente verá apenas os nomes dos placeholders, não os valores reais.
                 """)
                 
-                # Função para adicionar nova entrada
-                def add_sensitive_entry():
-                    st.session_state.sensitive_data_entries.append((f"x_data_{len(st.session_state.sensitive_data_entries)+1}", ""))
-                
-                # Função para remover entrada
-                def remove_sensitive_entry(index):
-                    st.session_state.sensitive_data_entries.pop(index)
-                
-                # Mostrar entradas existentes
-                for i, (placeholder, value) in enumerate(st.session_state.sensitive_data_entries):
+                # Mostrar entradas existentes (os callbacks atualizam apenas a entrada alterada)
+                entries = st.session_state.sensitive_data_entries
+                for i, (entry_id, (placeholder, value)) in enumerate(list(entries.items()), start=1):
                     col1, col2, col3 = st.columns([2, 3, 1])
                     with col1:
-                        new_placeholder = st.text_input(f"Nome do placeholder {i+1}", placeholder, key=f"placeholder_{i}")
+                        st.text_input(f"Nome do placeholder {i}", placeholder, key=f"placeholder_{entry_id}",
+                                      on_change=_update_sensitive_entry, args=(entry_id,))
                     with col2:
-                        new_value = st.text_input(f"Valor sensível {i+1}", value, type="password", key=f"value_{i}")
+                        st.text_input(f"Valor sensível {i}", value, type="password", key=f"value_{entry_id}",
+                                      on_change=_update_sensitive_entry, args=(entry_id,))
                     with col3:
-                        if st.button("🗑️", key=f"delete_{i}"):
-                            remove_sensitive_entry(i)
-                            st.experimental_rerun()
-                    
-                    # Atualizar valores
-                    st.session_state.sensitive_data_entries[i] = (new_placeholder, new_value)
+                        st.button("🗑️", key=f"delete_sensitive_{entry_id}",
+                                  on_click=_remove_sensitive_entry, args=(entry_id,))
                 
                 # Botão para adicionar nova entrada
-                if st.button("➕ Adicionar Dado Sensível"):
-                    add_sensitive_entry()
-                    st.experimental_rerun()
-                
-                # Converter entradas para dicionário
-                sensitive_data = {
-                    placeholder: value 
-                    for placeholder, value in st.session_state.sensitive_data_entries 
-                    if placeholder and value
-                }
+                st.button("➕ Adicionar Dado Sensível", on_click=_add_sensitive_entry)
                 
                 # Mostrar como usar na tarefa
-                if sensitive_data:
+                placeholders = [placeholder for placeholder, value in entries.values() if placeholder and value]
+                if placeholders:
                     st.markdown("### Como usar na tarefa:")
                     examples = []
-                    for placeholder in sensitive_data.keys():
+                    for placeholder in placeholders:
                         examples.append(f"- Use **{placeholder}** para o valor sensível (ex: 'Faça login com {placeholder}')")
                     st.markdown("\n".join(examples))
             
@@ -576,11 +647,11 @@ def create_task_page():
                         session.commit()
                     
                     st.session_state.current_task = task_id
-                    st.success(f"Tarefa criada! ID: {task_id}")
+                    # Notificação não bloqueante, que continua visível após o rerun
+                    st.toast(f"Tarefa criada! ID: {task_id}", icon="✅")
                     
                     # Redirecionar para página de detalhes
-                    time.sleep(1)
-                    st.experimental_rerun()
+                    st.rerun()
         
         with col2:
             # Dicas
@@ -607,15 +678,16 @@ def create_task_page():
             
             if st.button("Editar Configuração"):
                 st.switch_page("app.py")  # Volta para a página de configuração
-        logger.info("Página de criação de tarefas carregada com sucesso")
+        logger.debug("Página de criação de tarefas carregada com sucesso")
     except Exception as e:
-        logger.error(f"Erro ao carregar página de criação de tarefas: {e}")
+        logger.exception("Erro ao carregar página de criação de tarefas")
         st.error(f"Erro ao carregar página de criação de tarefas: {e}")
 
+@st.fragment
 def task_list_page():
     """Página que lista todas as tarefas com opção de exclusão"""
     try:
-        logger.info("Carregando página de lista de tarefas")
+        logger.debug("Carregando página de lista de tarefas")
         st.title("📋 Minhas Tarefas")
         
         # Verificar se há mensagem de confirmação para exibir
@@ -634,20 +706,33 @@ def task_list_page():
             del st.session_state.delete_message
         
         try:
-            # Obter tarefas do banco de dados
+            # Paginação por cursor: cada cursor é o created_at da última tarefa da página anterior
+            page_cursors = st.session_state.setdefault('task_page_cursors', [])
+            cursor = page_cursors[-1] if page_cursors else None
+            
+            # Obter apenas as colunas necessárias da página atual
             with get_db_session() as session:
-                # Converter as tarefas do SQLAlchemy para dicionários enquanto a sessão está aberta
-                task_dicts = []
-                for task in session.query(Task).order_by(Task.created_at.desc()).all():
-                    task_dicts.append({
-                        "id": task.id,
-                        "task": task.task,
-                        "status": task.status,
-                        "llm_provider": task.llm_provider,
-                        "llm_model": task.llm_model,
-                        "created_at": task.created_at,
-                        "finished_at": task.finished_at
-                    })
+                query = session.query(
+                    Task.id,
+                    Task.task,
+                    Task.status,
+                    Task.llm_provider,
+                    Task.llm_model,
+                    Task.created_at,
+                    Task.finished_at
+                )
+                if cursor is not None:
+                    query = query.filter(Task.created_at < cursor)
+                
+                # Buscar uma linha extra para saber se existe próxima página
+                rows = query.order_by(Task.created_at.desc()).limit(TASKS_PAGE_SIZE + 1).all()
+                has_next_page = len(rows) > TASKS_PAGE_SIZE
+                task_dicts = [row._asdict() for row in rows[:TASKS_PAGE_SIZE]]
+            
+            # Página ficou vazia (ex.: após exclusões), voltar ao início
+            if not task_dicts and page_cursors:
+                page_cursors.clear()
+                st.rerun()
             
             # Verificar se existem tarefas
             if not task_dicts:
@@ -664,276 +749,300 @@ def task_list_page():
                 col1, col2 = st.columns(2)
                 with col1:
                     if st.button("✅ Sim, deletar tudo"):
-                        success_count = 0
-                        total_tasks = len(task_dicts)
-                        
-                        for task in task_dicts:
-                            success, _ = delete_task(task["id"])
-                            if success:
-                                success_count += 1
-                        
-                        if success_count == total_tasks:
-                            st.session_state.delete_message = (True, f"Todas as {total_tasks} tarefas foram deletadas com sucesso!")
-                        else:
-                            st.session_state.delete_message = (False, f"Foram deletadas {success_count} de {total_tasks} tarefas.")
-                        
+                        # A lista é paginada, então todas as tarefas são excluídas de uma vez
+                        st.session_state.delete_message = delete_all_tasks()
                         st.session_state.confirm_delete_all = False
-                        st.experimental_rerun()
+                        st.rerun()
                 
                 with col2:
                     if st.button("❌ Cancelar"):
                         st.session_state.confirm_delete_all = False
-                        st.experimental_rerun()
+                        st.rerun(scope="fragment")
             
             # Exibir lista de tarefas
             st.write("### Lista de Tarefas")
             
-            for i, task in enumerate(task_dicts):
-                task_id = task["id"]
-                task_desc = task["task"][:50] + "..." if len(task["task"]) > 50 else task["task"]
-                task_status = task["status"]
-                task_date = format_datetime(task["created_at"])
+            # Uma única tabela em vez de colunas e botões por linha; as ações valem para a linha selecionada
+            first_index = len(page_cursors) * TASKS_PAGE_SIZE
+            tasks_df = pd.DataFrame({
+                "Nº": range(first_index + 1, first_index + len(task_dicts) + 1),
+                "Tarefa": [task["task"][:50] + "..." if len(task["task"]) > 50 else task["task"] for task in task_dicts],
+                "Status": [task["status"] for task in task_dicts],
+                "Criado": [format_datetime(task["created_at"]) for task in task_dicts],
+                "ID": [task["id"] for task in task_dicts]
+            })
+            selection = st.dataframe(
+                tasks_df,
+                hide_index=True,
+                use_container_width=True,
+                on_select="rerun",
+                selection_mode="single-row",
+                key=f"tasks_table_{len(page_cursors)}"  # Seleção independente por página
+            )
+            
+            selected_rows = [row for row in selection.selection.rows if row < len(task_dicts)]
+            if selected_rows:
+                task_id = task_dicts[selected_rows[0]]["id"]
                 
-                col1, col2, col3 = st.columns([3, 1, 1])
-                with col1:
-                    st.write(f"**{i+1}. {task_desc}** (ID: `{task_id}`)")
-                    st.write(f"Status: {task_status} | Criado: {task_date}")
-                with col2:
-                    if st.button(f"👁️ Ver Detalhes", key=f"view_{task_id}"):
+                view_col, delete_col = st.columns(2)
+                with view_col:
+                    if st.button("👁️ Ver Detalhes", key="view_selected_task", use_container_width=True):
                         st.session_state.current_task = task_id
-                        st.experimental_rerun()
-                with col3:
-                    if st.button(f"🗑️ Deletar", key=f"delete_{task_id}"):
-                        st.session_state[f"confirm_delete_{task_id}"] = True
+                        # A navegação muda o menu lateral, então a aplicação inteira é reexecutada
+                        st.rerun()
+                with delete_col:
+                    if st.button("🗑️ Deletar", key="delete_selected_task", use_container_width=True):
+                        st.session_state.confirm_delete_task = task_id
                 
                 # Mostrar confirmação de exclusão se necessário
-                if st.session_state.get(f"confirm_delete_{task_id}", False):
-                    st.warning(f"⚠️ Tem certeza que deseja deletar esta tarefa? Esta ação não pode ser desfeita!")
+                if st.session_state.get('confirm_delete_task') == task_id:
+                    st.warning("⚠️ Tem certeza que deseja deletar esta tarefa? Esta ação não pode ser desfeita!")
                     confirm_col1, confirm_col2 = st.columns(2)
                     with confirm_col1:
-                        if st.button(f"✅ Sim", key=f"confirm_yes_{task_id}"):
-                            success, message = delete_task(task_id)
-                            st.session_state.delete_message = (success, message)
-                            del st.session_state[f"confirm_delete_{task_id}"]
-                            st.experimental_rerun()
+                        if st.button("✅ Sim", key="confirm_delete_yes"):
+                            st.session_state.delete_message = delete_task(task_id)
+                            del st.session_state.confirm_delete_task
+                            st.rerun()
                     with confirm_col2:
-                        if st.button(f"❌ Não", key=f"confirm_no_{task_id}"):
-                            del st.session_state[f"confirm_delete_{task_id}"]
-                            st.experimental_rerun()
-                
-                st.markdown("---")
+                        if st.button("❌ Não", key="confirm_delete_no"):
+                            del st.session_state.confirm_delete_task
+                            st.rerun(scope="fragment")
+            else:
+                st.caption("Selecione uma tarefa na tabela para ver os detalhes ou deletá-la.")
+            
+            # Navegação entre páginas
+            if page_cursors or has_next_page:
+                prev_col, next_col = st.columns(2)
+                with prev_col:
+                    if st.button("← Página anterior", key="tasks_prev_page", disabled=not page_cursors):
+                        page_cursors.pop()
+                        st.rerun(scope="fragment")
+                with next_col:
+                    if st.button("Próxima página →", key="tasks_next_page", disabled=not has_next_page):
+                        page_cursors.append(task_dicts[-1]["created_at"])
+                        st.rerun(scope="fragment")
         
         except Exception as e:
             st.error(f"Ocorreu um erro ao carregar as tarefas: {str(e)}")
             st.code(str(e))
-        logger.info("Página de lista de tarefas carregada com sucesso")
+        logger.debug("Página de lista de tarefas carregada com sucesso")
     except Exception as e:
-        logger.error(f"Erro ao carregar página de lista de tarefas: {e}")
+        logger.exception("Erro ao carregar página de lista de tarefas")
         st.error(f"Erro ao carregar página de lista de tarefas: {e}")
 
-def execute_task_thread(task_id):
-    """Executa uma tarefa em uma thread separada"""
-    logger.info(f"Iniciando thread para executar tarefa {task_id}")
+@st.cache_resource
+def get_task_executor() -> ThreadPoolExecutor:
+    """Pool de threads compartilhado por todas as sessões para executar tarefas"""
+    return ThreadPoolExecutor(max_workers=TASK_EXECUTOR_WORKERS, thread_name_prefix="task-runner")
+
+@st.cache_resource
+def get_task_futures() -> Dict[str, Future]:
+    """Execuções em andamento por ID de tarefa (compartilhado entre sessões)"""
+    return {}
+
+@st.cache_resource
+def get_agent_loop() -> asyncio.AbstractEventLoop:
+    """Event loop único, executado em uma thread dedicada, compartilhado por todas as tarefas"""
+    try:
+        # uvloop (libuv) reduz o custo por callback; opcional, indisponível no Windows
+        import uvloop
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="agent-loop", daemon=True).start()
+    return loop
+
+def claim_task(task_id, force_rerun=False):
+    """Marca a tarefa como 'running' no banco de dados; retorna False se ela já estiver em execução"""
+    claimable_statuses = ['created', 'finished', 'failed'] if force_rerun else ['created']
+    now = datetime.now()
+    with get_db_session() as session:
+        result = session.execute(_CLAIM_TASK, {
+            'task_id_param': task_id,
+            'claimable_statuses': claimable_statuses,
+            'started_at': now,
+            'stuck_before': now - timedelta(minutes=30)
+        })
+        session.commit()
+    return result.rowcount == 1
+
+def submit_task_execution(task_id, force_rerun=False):
+    """Reivindica a tarefa e a envia para os workers do Celery ou para o pool de execução local; retorna (sucesso, mensagem)"""
+    if not claim_task(task_id, force_rerun):
+        logger.warning("Tarefa %s já está em execução", task_id)
+        return False, "Tarefa já está em execução"
     
-    # Adicionar flag para indicar que o navegador deve estar visível
-    st.session_state.browser_should_be_visible = not st.session_state.browser_config.get('headless', False)
+    # A thread não tem acesso ao st.session_state, então os dados são passados como argumentos
+    browser_config = dict(st.session_state.browser_config)
+    sensitive_data = {
+        placeholder: value 
+        for placeholder, value in st.session_state.get('sensitive_data_entries', {}).values() 
+        if placeholder and value
+    }
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    try:
+        if task_queue.is_enabled():
+            # Apenas o ID passa pelo broker: os parâmetros ficam na tarefa, com os dados sensíveis criptografados
+            store_execution_params(task_id, browser_config, sensitive_data)
+            # O andamento é acompanhado pelo status da tarefa no banco de dados
+            task_queue.enqueue_task(task_id)
+        else:
+            task_futures = get_task_futures()
+            task_future = get_task_executor().submit(execute_task_thread, task_id, browser_config, sensitive_data)
+            task_futures[task_id] = task_future
+            # Descartar o future (e o resultado que ele guarda) ao terminar, mesmo que ninguém abra a tarefa;
+            # sem ele, a página de detalhes acompanha o status pelo banco de dados
+            task_future.add_done_callback(
+                lambda f: task_futures.pop(task_id, None) if task_futures.get(task_id) is f else None
+            )
+    except Exception as e:
+        # Sem worker para executá-la, a tarefa não pode ficar em 'running' (ex.: broker indisponível)
+        logger.exception("Erro ao enviar tarefa %s para execução", task_id)
+        fail_task(task_id, e)
+        return False, f"Erro ao enviar tarefa para execução: {str(e)}"
+    return True, None
+
+def execute_task_thread(task_id, browser_config, sensitive_data=None):
+    """Executa uma tarefa em uma thread do pool de execução"""
+    logger.info("Iniciando thread para executar tarefa %s", task_id)
     
     try:
         # Logar configurações do navegador para debug
-        logger.info(f"Configurações do navegador para tarefa {task_id}:")
-        logger.info(f"- headless: {st.session_state.browser_config.get('headless', False)}")
-        logger.info(f"- show_browser: {st.session_state.browser_config.get('show_browser', True)}")
-        logger.info(f"- window size: {st.session_state.browser_config.get('browser_window_width', 1280)}x{st.session_state.browser_config.get('browser_window_height', 1100)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Configurações do navegador para tarefa %s:", task_id)
+            logger.debug("- headless: %s", browser_config.get('headless', False))
+            logger.debug("- show_browser: %s", browser_config.get('show_browser', True))
+            logger.debug("- window size: %sx%s", browser_config.get('browser_window_width', 1280), browser_config.get('browser_window_height', 1100))
         
-        # Executar a tarefa
-        result = loop.run_until_complete(execute_task_async(task_id))
-        st.session_state.task_result = result
-        logger.info(f"Tarefa {task_id} executada com sucesso")
+        # Executar a tarefa (o resultado é persistido no banco de dados)
+        future = asyncio.run_coroutine_threadsafe(
+            execute_task_async(task_id, browser_config, sensitive_data),
+            get_agent_loop()
+        )
+        result = future.result()
+        logger.info("Tarefa %s executada com sucesso", task_id)
+        return result
     except Exception as e:
-        logger.error(f"Erro ao executar tarefa {task_id}: {e}")
-        st.session_state.task_result = {"error": str(e)}
-    finally:
-        st.session_state.task_running = False
-        # Remover flag de visibilidade do navegador
-        if 'browser_should_be_visible' in st.session_state:
-            del st.session_state.browser_should_be_visible
-        loop.close()
+        logger.exception("Erro ao executar tarefa %s", task_id)
+        # Falha fora da execução do agente (ex.: banco de dados): não deixar a tarefa presa em 'running'
+        fail_task(task_id, e)
+        return {"error": str(e)}
+
+def _has_pending_execution(task_id):
+    """Verifica se a tarefa foi enviada ao pool e ainda não terminou (antes de ser marcada como 'running')"""
+    task_future = get_task_futures().get(task_id)
+    return task_future is not None and not task_future.done()
+
+def _file_mtime(path):
+    """Data de modificação do arquivo, ou None se ele não existir (um único stat por arquivo)"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
 
-async def execute_task_async(task_id):
-    """Executa uma tarefa específica assincronamente"""
-    logger.info(f"Executando tarefa {task_id} assincronamente")
+@st.cache_data(max_entries=64, ttl=600, show_spinner=False)
+def _load_image(path: str, mtime: float) -> bytes:
+    """Lê os bytes de uma captura de tela (em cache por caminho e data de modificação, com tamanho limitado)"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+@st.fragment(run_every=2)
+def _task_progress_fragment(task_id):
+    """Progresso da tarefa em execução, reexecutado a cada 2 segundos"""
+    # Execução disparada por este processo: o Future indica o término sem consultar o banco de dados
+    # (o histórico só é gravado ao final da execução)
+    task_future = get_task_futures().get(task_id)
+    if task_future is not None:
+        if task_future.done():
+            # Descartar o future antes do rerun: se o banco ainda indicar 'running' (ex.: falha ao gravar
+            # o resultado), as próximas execuções do fragmento passam a consultar o banco de dados
+            get_task_futures().pop(task_id, None)
+            st.rerun()
+        st.write("Status atual: **running**")
+        return
     
-    # Antes de iniciar qualquer coisa, verificar se a tarefa existe e o status atual
+    # Execução em outro processo (ex.: worker do Celery): verificar estado atual no banco de dados
     with get_db_session() as session:
-        task = session.query(Task).filter(Task.id == task_id).first()
-        
-        if not task:
-            logger.error(f"Tarefa {task_id} não encontrada")
-            return {"error": "Tarefa não encontrada"}
+        current_task = session.query(Task).options(joinedload(Task.history)).filter(Task.id == task_id).first()
+        current_status = current_task.status if current_task else "unknown"
         
-        # Se a tarefa já estiver em execução, finalizada ou falha, verificar tempo
-        if task.status in ['running', 'finished', 'failed']:
-            # Verificar se está em "running" por mais de 30 minutos - provável travamento
-            if task.status == 'running' and task.created_at:
-                time_diff = datetime.now() - task.created_at
-                
-                # Se passaram mais de 30 minutos, podemos assumir que houve um problema
-                if time_diff.total_seconds() > 1800:  # 30 minutos em segundos
-                    logger.warning(f"Tarefa {task_id} está em execução por mais de 30 minutos. Resetando status.")
-                    task.status = 'created'  # Reset para permitir nova execução
-                    session.commit()
-                else:
-                    # Está em execução por um tempo razoável, não devemos executar novamente
-                    logger.warning(f"Tarefa {task_id} já está em execução.")
-                    return {"error": "Tarefa já está em execução"}
-            elif task.status in ['finished', 'failed']:
-                # Verificar se o usuário quer reexecutar explicitamente
-                if not st.session_state.get('force_rerun_task', False):
-                    logger.info(f"Tarefa {task_id} já foi executada com status {task.status}.")
-                    return {"error": f"Tarefa já foi executada com status {task.status}. Use 'Executar Novamente' para forçar reexecução."}
-    
-    # Atualizar status para 'running'
-    with get_db_session() as session:
-        task = session.query(Task).filter(Task.id == task_id).first()
-        task.status = 'running'
-        session.commit()
-    
-    # Preparar API Key para o modelo selecionado
-    with get_db_session() as session:
-        api_keys = {key.provider: key.api_key for key in session.query(ApiKey).all()}
+        # Quando a execução termina, um rerun completo exibe os resultados
+        if current_status != 'running':
+            st.rerun()
         
-    if task.llm_provider == 'azure':
-        api_key = api_keys.get('azure', '')
-        endpoint = api_keys.get('azure_endpoint', '')
-        llm_info = {
-            'provider': task.llm_provider,
-            'model': task.llm_model,
-            'api_key': api_key,
-            'endpoint': endpoint
-        }
-    else:
-        api_key = api_keys.get(task.llm_provider, '')
-        llm_info = {
-            'provider': task.llm_provider,
-            'model': task.llm_model,
-            'api_key': api_key
-        }
+        # Verificar histórico para obter informações atuais
+        task_history = current_task.history if current_task else None
+        if task_history:
+            steps = task_history.steps or []
+            urls = task_history.urls or []
+            screenshots = task_history.screenshots or []
+            
+            # Mostrar progresso atual
+            st.write(f"Status atual: **{current_status}**")
+            st.write(f"Passos executados: **{len(steps)}**")
+            st.write(f"URLs visitadas: **{len(urls)}**")
+            
+            # Mostrar último screenshot se disponível
+            if screenshots:
+                last_screenshot = screenshots[-1]
+                last_mtime = _file_mtime(last_screenshot)
+                if last_mtime is not None:
+                    st.image(
+                        _load_image(last_screenshot, last_mtime),
+                        caption="Última captura de tela"
+                    )
+
+@st.fragment
+def _screenshot_slideshow(screenshots):
+    """Slideshow das capturas de tela; a navegação reexecuta apenas este fragmento"""
+    screenshot_index = st.session_state.get('screenshot_index', 0)
+    total_screenshots = len(screenshots)
     
-    # Obter dados sensíveis da sessão
-    sensitive_data = {}
-    if 'sensitive_data_entries' in st.session_state:
-        sensitive_data = {
-            placeholder: value 
-            for placeholder, value in st.session_state.sensitive_data_entries 
-            if placeholder and value
-        }
+    # Navegação do slideshow
+    col1, col2, col3 = st.columns([1, 10, 1])
     
-    # Forçar visualização se solicitado
-    browser_config = st.session_state.browser_config.copy()
-    if not browser_config.get('headless', False) or browser_config.get('show_browser', True):
-        browser_config['headless'] = False
-        browser_config['show_browser'] = True
-        logger.info("Configurado para mostrar o navegador durante a execução")
+    with col1:
+        if st.button("◀️", key="prev_screenshot", disabled=screenshot_index <= 0):
+            st.session_state.screenshot_index = max(0, screenshot_index - 1)
+            st.rerun(scope="fragment")
     
-    try:
-        logger.info(f"Executando agente para tarefa {task_id}")
-        # Executar o agente
-        result = await run_agent_task(
-            task_id=task_id,
-            task_instructions=task.task,
-            llm=llm_info,
-            browser_config=browser_config,
-            sensitive_data=sensitive_data
-        )
-        
-        # Atualizar o status da tarefa no banco de dados
-        with get_db_session() as session:
-            task = session.query(Task).filter(Task.id == task_id).first()
-            
-            if not task:
-                logger.error(f"Tarefa {task_id} não encontrada após execução")
-                return {"error": "Tarefa não encontrada após execução"}
-                
-            # Definir status correto
-            task.status = result.get('status', 'unknown')
-            if task.status not in ['created', 'running', 'finished', 'failed']:
-                task.status = 'finished' if not result.get('errors') else 'failed'
-                
-            task.finished_at = datetime.now()
-            task.output = result.get('output', '')
-            
-            # Criar ou atualizar o histórico da tarefa
-            task_history = session.query(TaskHistory).filter(TaskHistory.task_id == task_id).first()
-            
-            if task_history:
-                task_history.steps = json.dumps(result.get('steps', []))
-                task_history.urls = json.dumps(result.get('urls', []))
-                task_history.screenshots = json.dumps(result.get('screenshots', []))
-                task_history.errors = json.dumps(result.get('errors', []))
-            else:
-                task_history = TaskHistory(
-                    task_id=task_id,
-                    steps=json.dumps(result.get('steps', [])),
-                    urls=json.dumps(result.get('urls', [])),
-                    screenshots=json.dumps(result.get('screenshots', [])),
-                    errors=json.dumps(result.get('errors', []))
+    with col2:
+        # Exibir screenshot atual
+        if 0 <= screenshot_index < total_screenshots:
+            current_screenshot = screenshots[screenshot_index]
+            current_mtime = _file_mtime(current_screenshot)
+            if current_mtime is not None:
+                st.image(
+                    _load_image(current_screenshot, current_mtime),
+                    caption=f"Captura {screenshot_index + 1} de {total_screenshots}"
                 )
-                session.add(task_history)
-            
-            # Calcular duração total
-            if task.created_at and task.finished_at:
-                duration_seconds = (task.finished_at - task.created_at).total_seconds()
-                task_history.duration = str(int(duration_seconds))
-            
-            session.commit()
-        
-        # Limpar flag de reexecução forçada se existir
-        if 'force_rerun_task' in st.session_state:
-            del st.session_state['force_rerun_task']
-        
-        logger.info(f"Tarefa {task_id} concluída com status: {result.get('status', 'unknown')}")
-        return result
-        
-    except Exception as e:
-        logger.error(f"Erro durante execução da tarefa {task_id}: {str(e)}")
-        
-        # Atualizar status para falha em caso de exceção
-        with get_db_session() as session:
-            task = session.query(Task).filter(Task.id == task_id).first()
-            if task:
-                task.status = 'failed'
-                task.finished_at = datetime.now()
-                task.output = f"Erro na execução: {str(e)}"
-                session.commit()
-        
-        return {
-            "status": "failed",
-            "error": str(e),
-            "errors": [str(e)]
-        }
+            else:
+                st.warning(f"Imagem não encontrada: {current_screenshot}")
+    
+    with col3:
+        if st.button("▶️", key="next_screenshot", disabled=screenshot_index >= total_screenshots - 1):
+            st.session_state.screenshot_index = min(total_screenshots - 1, screenshot_index + 1)
+            st.rerun(scope="fragment")
 
 def task_detail_page():
     """Página de detalhes da tarefa atual"""
     try:
-        logger.info("Carregando página de detalhes da tarefa")
+        logger.debug("Carregando página de detalhes da tarefa")
         if not st.session_state.current_task:
             st.error("Nenhuma tarefa selecionada.")
             return
         
         task_id = st.session_state.current_task
         
-        # Obter tarefa e histórico do banco de dados
+        # Obter tarefa e histórico do banco de dados em uma única consulta
         with get_db_session() as session:
-            task = session.query(Task).filter(Task.id == task_id).first()
+            task = session.query(Task).options(joinedload(Task.history)).filter(Task.id == task_id).first()
             
             if not task:
                 st.error(f"Tarefa {task_id} não encontrada.")
                 if st.button("Voltar à lista de tarefas"):
                     st.session_state.current_task = None
-                    st.experimental_rerun()
+                    st.rerun()
                 return
             
             # Armazenar os atributos que precisamos enquanto a sessão está aberta
@@ -948,8 +1057,8 @@ def task_detail_page():
                 'output': task.output
             }
             
-            # Obter o histórico da tarefa
-            task_history = session.query(TaskHistory).filter(TaskHistory.task_id == task_id).first()
+            # Histórico já carregado junto com a tarefa
+            task_history = task.history
             history_data = None
             if task_history:
                 history_data = {
@@ -961,6 +1070,9 @@ def task_detail_page():
         
         # Exibir cabeçalho
         status = task_data['status']
+        
+        # O status no banco de dados é a fonte da verdade sobre a execução
+        task_running = status == 'running' or _has_pending_execution(task_id)
         status_color = get_status_color(status)
         
         st.title(f"📊 Detalhes da Tarefa")
@@ -975,43 +1087,34 @@ def task_detail_page():
         # Controles conforme o status
         with col2:
             if status == 'running':
-                st.info("Tarefa em execução. Aguarde a conclusão ou atualize a página para ver o progresso.")
-                if st.button("🔄 Atualizar Status", key="refresh_status"):
-                    st.experimental_rerun()
+                st.info("Tarefa em execução. O progresso é atualizado automaticamente.")
             elif status == 'created':
                 run_col1, run_col2 = st.columns(2)
                 with run_col1:
                     if st.button("▶️ Executar Tarefa", key="run_task", use_container_width=True):
-                        if not st.session_state.task_running:
-                            st.session_state.task_running = True
-                            logger.info(f"Iniciando execução da tarefa {task_id}")
-                            # Iniciar thread para executar a tarefa
-                            thread = threading.Thread(target=execute_task_thread, args=(task_id,))
-                            thread.daemon = True
-                            thread.start()
+                        logger.info("Iniciando execução da tarefa %s", task_id)
+                        # Enviar a tarefa para o pool de execução
+                        submitted, message = submit_task_execution(task_id)
+                        if submitted:
                             st.info("Iniciando execução da tarefa...")
-                            st.experimental_rerun()
+                            st.rerun()
+                        else:
+                            st.warning(message)
                 with run_col2:
-                    headless = st.checkbox("Executar em modo headless", value=st.session_state.browser_config.get('headless', False),
-                                    help="Se marcado, o navegador não será visível durante a execução")
-                    if headless != st.session_state.browser_config.get('headless', False):
-                        # Atualizar configuração
-                        browser_config = st.session_state.browser_config.copy()
-                        browser_config['headless'] = headless
-                        browser_config['show_browser'] = not headless
-                        st.session_state.browser_config = browser_config
+                    st.checkbox("Executar em modo headless", value=st.session_state.browser_config.get('headless', False),
+                                help="Se marcado, o navegador não será visível durante a execução",
+                                key="cfg_headless",
+                                on_change=_update_browser_option, args=('headless',))
             elif status in ['finished', 'failed']:
                 if st.button("🔄 Executar Novamente", key="rerun_task", use_container_width=True):
-                    st.session_state['force_rerun_task'] = True
-                    if not st.session_state.task_running:
-                        st.session_state.task_running = True
-                        logger.info(f"Reexecutando tarefa {task_id}")
-                        # Iniciar thread para executar a tarefa
-                        thread = threading.Thread(target=execute_task_thread, args=(task_id,))
-                        thread.daemon = True
-                        thread.start()
+                    logger.info("Reexecutando tarefa %s", task_id)
+                    # Enviar a tarefa para o pool de execução
+                    submitted, message = submit_task_execution(task_id, force_rerun=True)
+                    if submitted:
                         st.info("Reiniciando execução da tarefa...")
-                        st.experimental_rerun()
+                        st.rerun()
+                    else:
+                        st.warning(message)
         
         # Detalhes da tarefa
         st.markdown("### Informações da Tarefa")
@@ -1029,57 +1132,30 @@ def task_detail_page():
         st.code(task_data['task'])
         
         # Se a tarefa estiver em execução, mostrar informações de progresso
-        if st.session_state.task_running:
+        if task_running:
             st.info("A tarefa está sendo executada em segundo plano... Isso pode levar alguns minutos.")
             
-            if st.session_state.get('browser_should_be_visible', False):
+            if not st.session_state.browser_config.get('headless', False):
                 st.warning("⚠️ Um navegador deve estar visível em sua tela agora! Se você não o vê, pode haver um problema com a configuração.")
                 st.info("Dicas de solução: verifique se você está em um ambiente com interface gráfica, se não há bloqueio pelo sistema operacional, ou se o navegador está aberto fora da área visível da tela.")
             
-            progress_placeholder = st.empty()
-            
-            # Verificar estado atual
-            with get_db_session() as session:
-                current_task = session.query(Task).filter(Task.id == task_id).first()
-                current_status = current_task.status if current_task else "unknown"
-                
-                # Verificar histórico para obter informações atuais
-                task_history = session.query(TaskHistory).filter(TaskHistory.task_id == task_id).first()
-                if task_history:
-                    steps = json.loads(task_history.steps) if task_history.steps else []
-                    urls = json.loads(task_history.urls) if task_history.urls else []
-                    screenshots = json.loads(task_history.screenshots) if task_history.screenshots else []
-                    
-                    # Mostrar progresso atual
-                    with progress_placeholder.container():
-                        st.write(f"Status atual: **{current_status}**")
-                        st.write(f"Passos executados: **{len(steps)}**")
-                        st.write(f"URLs visitadas: **{len(urls)}**")
-                        
-                        # Mostrar último screenshot se disponível
-                        if screenshots:
-                            last_screenshot = screenshots[-1]
-                            if os.path.exists(last_screenshot):
-                                st.image(last_screenshot, caption="Última captura de tela")
-            
-            if st.button("Atualizar Progresso"):
-                st.experimental_rerun()
+            # Progresso atualizado pelo fragmento, sem rerun da página inteira
+            _task_progress_fragment(task_id)
         
-        # Se o resultado da tarefa estiver disponível na sessão, exibi-lo
-        if st.session_state.task_result and not st.session_state.task_running:
+        # Se a execução disparada por este processo terminou, exibir aviso e descartar o future
+        task_future = get_task_futures().get(task_id)
+        if task_future is not None and task_future.done():
             st.success("Tarefa concluída!")
-            # Limpar resultado após exibir
-            st.session_state.task_result = None
-            # Recarregar a página para mostrar os dados atualizados do banco
-            st.experimental_rerun()
+            get_task_futures().pop(task_id, None)
         
         # Se o status for 'created' e a tarefa não estiver em execução, propor execução
-        if status == 'created' and not st.session_state.task_running:
+        if status == 'created' and not task_running:
             st.info("Esta tarefa está aguardando execução. Clique em 'Executar Tarefa' para iniciá-la.")
         
         # Verificar se há gravação para esta tarefa
         recording_path = os.path.join(st.session_state.browser_config.get('recording_path', 'static/recordings'), f"{task_id}.webm")
-        if os.path.exists(recording_path):
+        has_recording = os.path.exists(recording_path)
+        if has_recording:
             st.markdown("### 🎬 Gravação da Execução")
             st.video(recording_path)
         
@@ -1103,11 +1179,11 @@ def task_detail_page():
         
         # Exibir resultados se a tarefa estiver concluída e houver dados no histórico
         if history_data and status in ['finished', 'failed']:
-            # Desserializar os dados do histórico
-            steps = json.loads(history_data['steps']) if history_data['steps'] else []
-            urls = json.loads(history_data['urls']) if history_data['urls'] else []
-            screenshots = json.loads(history_data['screenshots']) if history_data['screenshots'] else []
-            errors = json.loads(history_data['errors']) if history_data['errors'] else []
+            # Colunas JSON já retornam listas Python
+            steps = history_data['steps'] or []
+            urls = history_data['urls'] or []
+            screenshots = history_data['screenshots'] or []
+            errors = history_data['errors'] or []
             
             # Mostrar passos da execução
             if steps:
@@ -1130,35 +1206,10 @@ def task_detail_page():
                     st.markdown(f"- {url}")
             
             # Mostrar screenshots se disponíveis e não existir gravação
-            if screenshots and not os.path.exists(recording_path):
-                st.markdown("### 📸 Capturas de Tela")
-                
-                # Exibir slideshow com os screenshots
-                screenshot_index = st.session_state.get('screenshot_index', 0)
-                total_screenshots = len(screenshots)
-                
-                if total_screenshots > 0:
-                    # Navegação do slideshow
-                    col1, col2, col3 = st.columns([1, 10, 1])
-                    
-                    with col1:
-                        if st.button("◀️", key="prev_screenshot", disabled=screenshot_index <= 0):
-                            st.session_state.screenshot_index = max(0, screenshot_index - 1)
-                            st.experimental_rerun()
-                    
-                    with col2:
-                        # Exibir screenshot atual
-                        if 0 <= screenshot_index < total_screenshots:
-                            current_screenshot = screenshots[screenshot_index]
-                            if os.path.exists(current_screenshot):
-                                st.image(current_screenshot, caption=f"Captura {screenshot_index + 1} de {total_screenshots}")
-                            else:
-                                st.warning(f"Imagem não encontrada: {current_screenshot}")
-                    
-                    with col3:
-                        if st.button("▶️", key="next_screenshot", disabled=screenshot_index >= total_screenshots - 1):
-                            st.session_state.screenshot_index = min(total_screenshots - 1, screenshot_index + 1)
-                            st.experimental_rerun()
+            if screenshots and not has_recording:
+                # Capturas agrupadas em um expander recolhido por padrão
+                with st.expander(f"📸 Capturas de Tela ({len(screenshots)})"):
+                    _screenshot_slideshow(screenshots)
             
             # Mostrar resultado final
             if task_data['output']:
@@ -1174,75 +1225,66 @@ def task_detail_page():
         # Botão para voltar à lista
         if st.button("← Voltar à lista de tarefas", key="back_to_list"):
             st.session_state.current_task = None
-            st.experimental_rerun()
-        logger.info("Página de detalhes da tarefa carregada com sucesso")
+            st.rerun()
+        logger.debug("Página de detalhes da tarefa carregada com sucesso")
     except Exception as e:
-        logger.error(f"Erro ao carregar página de detalhes da tarefa: {e}")
+        logger.exception("Erro ao carregar página de detalhes da tarefa")
         st.error(f"Erro ao carregar página de detalhes da tarefa: {e}")
 
+# Página exibida para cada opção do menu de navegação
+_ROUTES = {
+    "Configuração": auth_page,
+    "Criar Tarefa": create_task_page,
+    "Minhas Tarefas": task_list_page,
+    "Detalhes da Tarefa": task_detail_page
+}
+
+@st.cache_resource(show_spinner=False)
+def _bootstrap_db():
+    """Inicializa o banco de dados uma única vez por processo (compartilhado entre sessões)"""
+    logger.info("Inicializando banco de dados...")
+    init_db()
+    # create_all não altera tabelas existentes: colunas, tipos e índices novos vêm da migração
+    if not run_migration():
+        logger.warning("Problemas ao verificar/atualizar banco de dados")
+    logger.info("Banco de dados inicializado com sucesso")
+    # Execuções interrompidas por um reinício do processo voltam a ficar disponíveis
+    MaintenanceManager().reset_stuck_tasks()
+    return True
+
 def main():
     """Função principal"""
     try:
-        logger.info("Iniciando função principal")
-        # Inicializar banco de dados se necessário
-        if not st.session_state.get('db_initialized', False):
-            try:
-                logger.info("Inicializando banco de dados...")
-                init_db()
-                logger.info("Banco de dados inicializado com sucesso")
-                
-                # Carregar configurações do navegador do banco de dados
-                with get_db_session() as session:
-                    browser_config = session.query(ApiKey).filter(ApiKey.provider == 'browser_config').first()
-                    if browser_config and browser_config.api_key:
-                        try:
-                            st.session_state.browser_config = json.loads(browser_config.api_key)
-                            logger.info("Configurações do navegador carregadas do banco de dados")
-                        except Exception as e:
-                            logger.error(f"Erro ao carregar configurações do navegador: {e}")
-                
-                st.session_state.db_initialized = True
-                logger.info("Inicialização concluída")
-            except Exception as e:
-                logger.error(f"Erro ao inicializar banco de dados: {e}")
+        logger.debug("Iniciando função principal")
+        # Inicializar banco de dados (executado apenas na primeira sessão do processo)
+        _bootstrap_db()
         
         # Inicializar estado da sessão
         init_session_state()
+        current_task = st.session_state.current_task
         
         # Sidebar - versão mais simples para evitar problemas de renderização
         with st.sidebar:
-            st.title("🤖 Gerenciador de Agentes IA")
+            st.title(_SIDEBAR_TITLE)
             
             # Menu simplificado
-            nav_options = ["Configuração", "Criar Tarefa", "Minhas Tarefas"]
-            if st.session_state.current_task:
-                nav_options.append("Detalhes da Tarefa")
-                
             nav_option = st.radio(
                 "Navegação",
-                options=nav_options,
+                options=_NAV_WITH_TASK if current_task else _BASE_NAV,
                 index=0
             )
         
         # Conteúdo principal
-        if nav_option == "Configuração":
-            auth_page()
-        elif nav_option == "Detalhes da Tarefa" and st.session_state.current_task:
-            task_detail_page()
-        elif nav_option == "Minhas Tarefas":
-            task_list_page()
-        else:
-            create_task_page()
+        handler = _ROUTES.get(nav_option, create_task_page)
+        if nav_option == "Detalhes da Tarefa" and not current_task:
+            handler = create_task_page
+        handler()
         
-        logger.info("Função principal executada com sucesso")
+        logger.debug("Função principal executada com sucesso")
     except Exception as e:
-        logger.error(f"Erro na função principal: {e}")
+        logger.exception("Erro na função principal")
         st.error(f"Ocorreu um erro: {e}")
 
+# O Streamlit executa o script como __main__, então esta chamada roda a cada rerun
 if __name__ == "__main__":
-    try:
-        logger.info("Iniciando a aplicação")
-        main()
-        logger.info("Aplicação iniciada com sucesso")
-    except Exception as e:
-        logger.error(f"Erro ao iniciar a aplicação: {e}")
\ No newline at end of file
+    main()
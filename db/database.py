@@ -1,15 +1,30 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, scoped_session
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import DeclarativeBase, sessionmaker, scoped_session
 import logging
 
+try:
+    # orjson serializa as colunas JSON do histórico bem mais rápido que o json da biblioteca padrão
+    import orjson
+    
+    def _json_serializer(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    _json_deserializer = orjson.loads
+except ImportError:
+    import json
+    
+    _json_serializer = json.dumps
+    _json_deserializer = json.loads
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Base para modelos SQLAlchemy
-Base = declarative_base()
+# Base para modelos SQLAlchemy (estilo declarativo 2.0)
+class Base(DeclarativeBase):
+    pass
 
 # Função para obter a string de conexão do banco de dados
 def get_database_url():
@@ -38,6 +53,14 @@ def get_database_url():
         logger.info("Usando banco de dados SQLite local")
         return 'sqlite:///./site_agente.db'
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL permite que a interface leia enquanto a thread da tarefa grava o progresso"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
 # Configuração do engine do SQLAlchemy
 def create_db_engine():
     database_url = get_database_url()
@@ -48,19 +71,26 @@ def create_db_engine():
         if database_url.startswith('postgresql'):
             return create_engine(
                 database_url,
-                pool_size=5,
-                max_overflow=10,
+                pool_size=10,
+                max_overflow=20,
                 pool_timeout=30,
                 pool_recycle=1800,  # Reciclar conexões a cada 30 minutos
+                pool_pre_ping=True,  # Descartar conexões mortas antes de usá-las
+                json_serializer=_json_serializer,
+                json_deserializer=_json_deserializer,
                 echo=False  # Definir como True para debug
             )
         else:
             # SQLite para desenvolvimento local
-            return create_engine(
+            sqlite_engine = create_engine(
                 database_url,
                 connect_args={"check_same_thread": False},  # Necessário para SQLite
+                json_serializer=_json_serializer,
+                json_deserializer=_json_deserializer,
                 echo=False
             )
+            event.listen(sqlite_engine, "connect", _set_sqlite_pragmas)
+            return sqlite_engine
     except Exception as e:
         logger.error(f"Erro ao criar engine: {str(e)}")
         
@@ -85,8 +115,9 @@ except Exception as e:
         raise
 
 # Fábrica de sessões
+# expire_on_commit=False evita um novo SELECT ao acessar atributos após o commit
 SessionLocal = scoped_session(
-    sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 )
 
 # Função para inicializar o banco de dados
@@ -113,9 +144,16 @@ def init_db():
         raise
 
 # Contexto de sessão para uso com 'with'
+@contextmanager
 def get_db_session():
     session = SessionLocal()
     try:
-        return session
+        yield session
+    except Exception:
+        # Não devolver ao pool uma conexão com transação pendente
+        session.rollback()
+        raise
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
+        # Liberar o registro por thread do scoped_session
+        SessionLocal.remove()
\ No newline at end of file
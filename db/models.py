@@ -1,83 +1,95 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Boolean, JSON
-from sqlalchemy.orm import relationship
+from typing import Any, Optional
+from sqlalchemy import String, Text, DateTime, Integer, BigInteger, ForeignKey, Boolean, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from db.database import Base
 
+# JSON nativo: JSONB no PostgreSQL, JSON (texto) nos demais bancos
+JsonType = JSON().with_variant(JSONB(), 'postgresql')
+
 class Task(Base):
     """Modelo para tarefas de agente"""
     __tablename__ = "tasks"
-    
-    id = Column(String(32), primary_key=True)
-    task = Column(Text, nullable=False)
-    status = Column(String(20), default="created")  # created, running, finished, failed
-    llm_provider = Column(String(50), nullable=False)
-    llm_model = Column(String(50), nullable=False)
-    created_at = Column(DateTime, default=datetime.now)
-    finished_at = Column(DateTime, nullable=True)
-    output = Column(Text, nullable=True)
-    config = Column(Text, nullable=True)  # Configurações específicas da tarefa como JSON
-    sensitive_data = Column(Text, nullable=True)  # Dados sensíveis criptografados
-    
+    __table_args__ = (
+        # Índice usado pela listagem paginada (ORDER BY created_at DESC)
+        Index('ix_task_created_at', 'created_at'),
+        # Execuções em 'running' travadas há mais de 30 minutos
+        Index('ix_task_status_started_at', 'status', 'started_at'),
+    )
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    task: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[Optional[str]] = mapped_column(String(20), default="created")  # created, running, finished, failed
+    llm_provider: Mapped[str] = mapped_column(String(50), nullable=False)
+    llm_model: Mapped[str] = mapped_column(String(50), nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.now)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # Início da execução atual
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    output: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    config: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Configurações específicas da tarefa como JSON
+    sensitive_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Dados sensíveis criptografados
+
     # Relacionamento com o histórico
-    history = relationship("TaskHistory", back_populates="task", uselist=False, cascade="all, delete-orphan")
-    
+    history: Mapped[Optional["TaskHistory"]] = relationship(back_populates="task", uselist=False, cascade="all, delete-orphan")
+
     def __repr__(self):
         return f"<Task {self.id}: {self.status}>"
 
 class TaskHistory(Base):
     """Modelo para histórico de tarefas"""
     __tablename__ = "task_history"
-    
-    task_id = Column(String(32), ForeignKey("tasks.id"), primary_key=True)
-    steps = Column(Text, nullable=True)  # Armazenado como JSON
-    urls = Column(Text, nullable=True)  # Armazenado como JSON
-    screenshots = Column(Text, nullable=True)  # Armazenado como JSON
-    errors = Column(Text, nullable=True)  # Armazenado como JSON
-    
+
+    task_id: Mapped[str] = mapped_column(String(32), ForeignKey("tasks.id"), primary_key=True)
+    steps: Mapped[Optional[Any]] = mapped_column(JsonType, nullable=True)
+    urls: Mapped[Optional[Any]] = mapped_column(JsonType, nullable=True)
+    screenshots: Mapped[Optional[Any]] = mapped_column(JsonType, nullable=True)
+    errors: Mapped[Optional[Any]] = mapped_column(JsonType, nullable=True)
+
     # Métricas adicionais
-    duration = Column(DateTime, nullable=True)  # Duração da execução em segundos
-    memory_usage = Column(String(50), nullable=True)  # Uso de memória durante a execução
-    token_usage = Column(String(50), nullable=True)  # Tokens usados pelo LLM
-    
+    duration: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # Duração da execução em segundos
+    memory_usage: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)  # Uso de memória durante a execução (bytes)
+    token_usage: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # Tokens usados pelo LLM
+
     # Relacionamento com a tarefa
-    task = relationship("Task", back_populates="history")
-    
+    task: Mapped["Task"] = relationship(back_populates="history")
+
     def __repr__(self):
         return f"<TaskHistory for {self.task_id}>"
 
 class ApiKey(Base):
     """Modelo para chaves de API"""
     __tablename__ = "api_keys"
-    
-    provider = Column(String(50), primary_key=True)
-    api_key = Column(String(512), nullable=True)  # Armazenará também objetos JSON para configurações
-    
+
+    provider: Mapped[str] = mapped_column(String(50), primary_key=True)
+    api_key: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)  # Armazenará também objetos JSON para configurações
+
     def __repr__(self):
         return f"<ApiKey for {self.provider}>"
 
 class CustomFunction(Base):
     """Modelo para funções personalizadas"""
     __tablename__ = "custom_functions"
-    
-    id = Column(String(32), primary_key=True)
-    name = Column(String(100), nullable=False)
-    description = Column(Text, nullable=False)
-    code = Column(Text, nullable=False)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.now)
-    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
-    
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
+    code: Mapped[str] = mapped_column(Text, nullable=False)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.now)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.now, onupdate=datetime.now)
+
     def __repr__(self):
         return f"<CustomFunction {self.name}>"
 
 class OutputFormat(Base):
     """Modelo para formatos de saída personalizados"""
     __tablename__ = "output_formats"
-    
-    id = Column(String(32), primary_key=True)
-    name = Column(String(100), nullable=False)
-    format_schema = Column(Text, nullable=False)  # JSON schema ou exemplo
-    created_at = Column(DateTime, default=datetime.now)
-    
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    format_schema: Mapped[str] = mapped_column(Text, nullable=False)  # JSON schema ou exemplo
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.now)
+
     def __repr__(self):
-        return f"<OutputFormat {self.name}>"
\ No newline at end of file
+        return f"<OutputFormat {self.name}>"
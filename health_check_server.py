@@ -6,11 +6,15 @@ Executado como processo independente do Streamlit.
 
 import os
 import sys
+import json
 import logging
+import logging.handlers
 import time
+import errno
+import select
 import socket
-from threading import Thread
-from flask import Flask, jsonify, request
+from threading import Thread, Lock
+from flask import Flask, Response, jsonify
 
 # Configuração de logging
 logging.basicConfig(
@@ -18,7 +22,8 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler("healthcheck.log")
+        # Arquivo com tamanho limitado: o healthcheck roda indefinidamente
+        logging.handlers.RotatingFileHandler("healthcheck.log", maxBytes=1_000_000, backupCount=2)
     ]
 )
 logger = logging.getLogger("health-check")
@@ -29,31 +34,80 @@ STREAMLIT_PORT = int(os.environ.get('PORT', 8080))
 
 app = Flask(__name__)
 
-def check_streamlit_running():
-    """Verifica se o Streamlit está rodando na porta configurada"""
+# Contagem de requisições, registrada em um resumo periódico em vez de uma linha de log por requisição
+HITS_LOG_INTERVAL = 60
+_hits = {'health': 0, 'status': 0, 'root': 0}
+_hits_lock = Lock()
+
+def _count_hit(endpoint):
+    with _hits_lock:
+        _hits[endpoint] += 1
+
+def _log_hits_periodically():
+    """Registra a cada HITS_LOG_INTERVAL segundos quantas requisições cada endpoint recebeu"""
+    while True:
+        time.sleep(HITS_LOG_INTERVAL)
+        with _hits_lock:
+            counts = dict(_hits)
+            for endpoint in _hits:
+                _hits[endpoint] = 0
+        if any(counts.values()):
+            logger.info(f"Requisições nos últimos {HITS_LOG_INTERVAL}s: {counts}")
+
+# Respostas constantes serializadas uma única vez na importação
+_HEALTH_BODY = b'{"status":"healthy"}'
+_ROOT_BODY = json.dumps({
+    "status": "ok",
+    "message": "Servidor de healthcheck ativo",
+    "port": PORT
+}).encode()
+
+# Códigos de retorno de um connect não bloqueante ainda em andamento
+_CONNECT_PENDING = {0, errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+
+def is_port_open(port, timeout=0.1):
+    """Testa a porta local com connect não bloqueante, limitando a espera a `timeout` segundos"""
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(1)
-            result = s.connect_ex(('localhost', STREAMLIT_PORT))
-            return result == 0
-    except:
+        s.setblocking(False)
+        if s.connect_ex(('localhost', port)) not in _CONNECT_PENDING:
+            return False
+        _, writable, _ = select.select([], [s], [], timeout)
+        return bool(writable) and s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+    except OSError:
         return False
+    finally:
+        s.close()
+
+# Resultado da última verificação, compartilhado pelas requisições do mesmo intervalo
+STREAMLIT_PROBE_TTL = 1.0
+_probe_cache = {'ts': float('-inf'), 'val': False}
+_probe_lock = Lock()
+
+def check_streamlit_running():
+    """Verifica se o Streamlit está rodando na porta configurada (no máximo uma conexão por segundo)"""
+    with _probe_lock:
+        now = time.monotonic()
+        if now - _probe_cache['ts'] < STREAMLIT_PROBE_TTL:
+            return _probe_cache['val']
+        _probe_cache['val'] = is_port_open(STREAMLIT_PORT)
+        _probe_cache['ts'] = now
+        return _probe_cache['val']
 
 @app.route('/health')
 def health():
     """Endpoint de healthcheck principal usado pelo Railway"""
-    client_ip = request.remote_addr
-    logger.info(f"Recebida requisição de healthcheck de {client_ip}")
+    _count_hit('health')
     
     # Por segurança, vamos retornar healthy mesmo que o Streamlit não esteja rodando ainda
     # Durante o período inicial de inicialização
-    return jsonify({"status": "healthy"})
+    return Response(_HEALTH_BODY, mimetype='application/json')
 
 @app.route('/status')
 def status():
     """Endpoint para verificação detalhada do status"""
+    _count_hit('status')
     streamlit_running = check_streamlit_running()
-    logger.info(f"Status detalhado: Streamlit rodando: {streamlit_running}")
     
     return jsonify({
         "status": "ok",
@@ -66,13 +120,8 @@ def status():
 @app.route('/')
 def root():
     """Endpoint raiz para verificação manual"""
-    client_ip = request.remote_addr
-    logger.info(f"Recebida requisição na raiz de {client_ip}")
-    return jsonify({
-        "status": "ok",
-        "message": "Servidor de healthcheck ativo",
-        "port": PORT
-    })
+    _count_hit('root')
+    return Response(_ROOT_BODY, mimetype='application/json')
 
 @app.route('/ping')
 def ping():
@@ -85,15 +134,17 @@ if __name__ == "__main__":
     logger.info(f"Verificando Streamlit na porta {STREAMLIT_PORT}")
     
     # Verificar portas em uso
-    ports_in_use = []
-    for port in [PORT, STREAMLIT_PORT]:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            result = s.connect_ex(('localhost', port))
-            if result == 0:
-                ports_in_use.append(port)
+    ports_in_use = [port for port in [PORT, STREAMLIT_PORT] if is_port_open(port)]
     
     if ports_in_use:
         logger.warning(f"Portas já em uso: {ports_in_use}")
     
-    # Iniciar Flask sem mensagens de desenvolvimento
-    app.run(host='0.0.0.0', port=PORT, threaded=True)
\ No newline at end of file
+    Thread(target=_log_hits_periodically, name="health-hits", daemon=True).start()
+    
+    # Servir com o waitress (pool fixo de threads); o servidor de desenvolvimento do Flask fica como fallback
+    try:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=PORT, threads=4, connection_limit=64, channel_timeout=5)
+    except ImportError:
+        logger.warning("waitress não instalado, usando o servidor de desenvolvimento do Flask")
+        app.run(host='0.0.0.0', port=PORT, threaded=True)
\ No newline at end of file
@@ -6,9 +6,10 @@ garantindo que o healthcheck esteja sempre disponível.
 """
 
 import os
+import json
 import logging
 import argparse
-from flask import Flask, jsonify, request
+from flask import Flask, Response, request
 
 # Configurar logging
 logging.basicConfig(
@@ -20,20 +21,24 @@ logger = logging.getLogger(__name__)
 def create_app(port=5000):
     """Cria e configura a aplicação Flask para healthcheck"""
     app = Flask(__name__)
+    
+    # Respostas constantes serializadas uma única vez
+    health_body = b'{"status":"healthy"}'
+    root_body = json.dumps({
+        "status": "ok",
+        "message": "Servidor de healthcheck ativo",
+        "port": port
+    }).encode()
 
     @app.route('/health')
     def health():
-        logger.info(f"Requisição de healthcheck recebida em {request.path} de {request.remote_addr}")
-        return jsonify({"status": "healthy"})
+        logger.debug("Requisição de healthcheck recebida em %s de %s", request.path, request.remote_addr)
+        return Response(health_body, mimetype='application/json')
 
     @app.route('/')
     def root():
-        logger.info(f"Requisição na raiz recebida de {request.remote_addr}")
-        return jsonify({
-            "status": "ok", 
-            "message": "Servidor de healthcheck ativo",
-            "port": port
-        })
+        logger.debug("Requisição na raiz recebida de %s", request.remote_addr)
+        return Response(root_body, mimetype='application/json')
 
     return app
 
@@ -46,4 +51,11 @@ if __name__ == "__main__":
     logger.info(f"Iniciando servidor de healthcheck na porta {port}")
     
     app = create_app(port)
-    app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
+    
+    # Servir com o waitress (pool fixo de threads); o servidor de desenvolvimento do Flask fica como fallback
+    try:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=port, threads=4, connection_limit=64, channel_timeout=5)
+    except ImportError:
+        logger.warning("waitress não instalado, usando o servidor de desenvolvimento do Flask")
+        app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
@@ -1,5 +1,6 @@
 import os
 import sys
+import json
 import logging
 from typing import Dict
 
@@ -7,9 +8,29 @@ from typing import Dict
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def init_directories():
-    """Inicializa os diretórios necessários para o funcionamento do aplicativo"""
-    directories = [
+# Configuração padrão do navegador, serializada uma única vez na importação
+DEFAULT_BROWSER_CONFIG = {
+    'headless': False,  # Alterado para False por padrão para visualizar o navegador
+    'disable_security': True,
+    'browser_window_width': 1280,
+    'browser_window_height': 1100,
+    'highlight_elements': True,
+    'chrome_instance_path': None,
+    'wait_for_network_idle': 3.0,
+    'minimum_wait_page_load_time': 0.5,
+    'maximum_wait_page_load_time': 5.0,
+    'max_steps': 15,
+    'full_page_screenshot': False,
+    'use_vision': True,
+    'allowed_domains': [],
+    'save_recording': True,  # Nova opção para gravar a execução
+    'recording_path': 'static/recordings',  # Caminho para salvar as gravações
+    'show_browser': True  # Nova opção para mostrar o navegador durante a execução
+}
+DEFAULT_BROWSER_CONFIG_JSON = json.dumps(DEFAULT_BROWSER_CONFIG, separators=(',', ':'))
+
+# Diretórios necessários para o funcionamento do aplicativo
+DIRECTORIES = (
     "db",
     "utils",
     "static",
@@ -17,12 +38,16 @@ def init_directories():
     "static/recordings",  # Nova pasta para gravações
     "downloads",          # Pasta para arquivos salvos pelo agente
     "temp_uploads"        # Pasta para uploads temporários
-]
-    
-    for directory in directories:
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-            logger.info(f"Diretório criado: {directory}")
+)
+
+def init_directories():
+    """Inicializa os diretórios necessários para o funcionamento do aplicativo"""
+    for directory in DIRECTORIES:
+        # Um único mkdir por diretório; exist_ok ignora os que já existem
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            logger.error(f"Erro ao criar diretório {directory}: {e}")
 
 def init_database():
     """Inicializa o banco de dados"""
@@ -34,9 +59,16 @@ def init_database():
             
         # Importar após criar diretórios
         from db.database import init_db
+        from utils.db_migration import run_migration
         
         # Inicializar banco de dados
         init_db()
+        
+        # create_all não altera tabelas existentes: colunas, tipos e índices novos vêm da migração
+        if not run_migration():
+            logger.warning("Problemas ao verificar/atualizar banco de dados")
+            return False
+        
         logger.info("Banco de dados inicializado com sucesso")
         return True
     except Exception as e:
@@ -52,39 +84,19 @@ def init_default_config():
             return False
             
         # Importações necessárias
-        import json
         from db.database import get_db_session
         from db.models import ApiKey
         
-        default_browser_config = {
-            'headless': False,  # Alterado para False por padrão para visualizar o navegador
-            'disable_security': True,
-            'browser_window_width': 1280,
-            'browser_window_height': 1100,
-            'highlight_elements': True,
-            'chrome_instance_path': None,
-            'wait_for_network_idle': 3.0,
-            'minimum_wait_page_load_time': 0.5,
-            'maximum_wait_page_load_time': 5.0,
-            'max_steps': 15,
-            'full_page_screenshot': False,
-            'use_vision': True,
-            'allowed_domains': [],
-            'save_recording': True,  # Nova opção para gravar a execução
-            'recording_path': 'static/recordings',  # Caminho para salvar as gravações
-            'show_browser': True  # Nova opção para mostrar o navegador durante a execução
-        }
-
-        
         with get_db_session() as session:
             # Verificar se já existe configuração
-            browser_config = session.query(ApiKey).filter(ApiKey.provider == 'browser_config').first()
+            # provider é a chave primária: busca direta pelo mapa de identidade
+            browser_config = session.get(ApiKey, 'browser_config')
             
             if not browser_config:
                 # Criar configuração padrão
                 browser_config = ApiKey(
                     provider='browser_config',
-                    api_key=json.dumps(default_browser_config)
+                    api_key=DEFAULT_BROWSER_CONFIG_JSON
                 )
                 session.add(browser_config)
                 session.commit()
@@ -2,6 +2,7 @@ import os
 import logging
 import time
 import sys
+import threading
 
 # Configuração de logging
 logging.basicConfig(
@@ -23,6 +24,15 @@ def check_railway_environment():
         logger.info("Executando em ambiente local")
     return bool(is_railway)
 
+def check_playwright():
+    """Verifica se o Playwright está instalado"""
+    try:
+        logger.info("Verificando instalação do Playwright")
+        from playwright.async_api import async_playwright
+        logger.info("Playwright importado com sucesso")
+    except Exception as e:
+        logger.warning(f"Erro ao verificar Playwright: {e}")
+
 def run_initialization():
     """Executa todos os passos de inicialização"""
     # Definir variáveis de ambiente comuns se não existirem
@@ -31,6 +41,16 @@ def run_initialization():
         logger.info("Definido fuso horário: America/Sao_Paulo")
     
     try:
+        # Configurar healthcheck para Railway primeiro, para que /health responda durante o restante da inicialização
+        if check_railway_environment():
+            try:
+                logger.info("Configurando healthcheck para Railway")
+                from utils.health_check import setup_healthcheck
+                setup_healthcheck()
+                logger.info("Healthcheck configurado com sucesso")
+            except Exception as e:
+                logger.warning(f"Erro ao configurar healthcheck: {e}")
+        
         # Criar diretórios necessários
         try:
             from init_app import init_directories
@@ -65,16 +85,6 @@ def run_initialization():
         except ImportError as e:
             logger.warning(f"Não foi possível importar init_default_config: {e}")
         
-        # Configurar healthcheck para Railway
-        if check_railway_environment():
-            try:
-                logger.info("Configurando healthcheck para Railway")
-                from utils.health_check import setup_healthcheck
-                setup_healthcheck()
-                logger.info("Healthcheck configurado com sucesso")
-            except Exception as e:
-                logger.warning(f"Erro ao configurar healthcheck: {e}")
-        
         # Configurar tarefa de manutenção
         try:
             logger.info("Configurando tarefa de manutenção")
@@ -84,13 +94,8 @@ def run_initialization():
         except Exception as e:
             logger.warning(f"Erro ao configurar tarefa de manutenção: {e}")
         
-        # Verificar se o Playwright está instalado
-        try:
-            logger.info("Verificando instalação do Playwright")
-            from playwright.async_api import async_playwright
-            logger.info("Playwright importado com sucesso")
-        except Exception as e:
-            logger.warning(f"Erro ao verificar Playwright: {e}")
+        # Verificar se o Playwright está instalado (importação pesada, feita em segundo plano)
+        threading.Thread(target=check_playwright, name="playwright-check", daemon=True).start()
         
         # Verificar integração com Browser-use - DESABILITADO TEMPORARIAMENTE
         # try:
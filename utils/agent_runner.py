@@ -24,6 +24,12 @@ logger = logging.getLogger(__name__)
 # Implementação do LLM para diferentes provedores
 async def call_llm(provider, model, api_key, prompt, endpoint=None, image_data=None, use_vision=True):
     """Função para chamar diferentes provedores de LLM com suporte a visão."""
+    # Os clientes dos provedores são síncronos: rodar em uma thread para não bloquear o event loop
+    # compartilhado, onde o Playwright das demais tarefas continua executando
+    return await asyncio.to_thread(_call_llm_sync, provider, model, api_key, prompt, endpoint, image_data, use_vision)
+
+def _call_llm_sync(provider, model, api_key, prompt, endpoint=None, image_data=None, use_vision=True):
+    """Chamada bloqueante ao provedor de LLM (executada fora do event loop por call_llm)."""
     try:
         messages = [{"role": "user", "content": prompt}]
 
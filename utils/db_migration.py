@@ -18,6 +18,20 @@ class DBMigrationManager:
     Esta classe fornece métodos para verificar a estrutura do banco de dados
     e realizar migrações quando necessário.
     """
+    # Colunas cujo tipo mudou nos modelos: {tabela: {coluna: expressão USING (PostgreSQL)}}
+    CONVERTED_COLUMNS = {
+        'task_history': {
+            'steps': 'steps::jsonb',
+            'urls': 'urls::jsonb',
+            'screenshots': 'screenshots::jsonb',
+            'errors': 'errors::jsonb',
+            # A duração era gravada em uma coluna DateTime, sem valor aproveitável como segundos
+            'duration': 'NULL::integer',
+            'memory_usage': "CASE WHEN memory_usage ~ '^[0-9]+$' THEN memory_usage::bigint END",
+            'token_usage': "CASE WHEN token_usage ~ '^[0-9]+$' THEN token_usage::integer END"
+        }
+    }
+    
     def __init__(self):
         self.inspector = inspect(engine)
     
@@ -42,6 +56,18 @@ class DBMigrationManager:
         """
         return self.inspector.get_columns(table_name)
     
+    def get_table_indexes(self, table_name: str) -> List[str]:
+        """
+        Obtém a lista de nomes dos índices de uma tabela.
+        
+        Args:
+            table_name: Nome da tabela
+            
+        Returns:
+            Lista de nomes de índices
+        """
+        return [index['name'] for index in self.inspector.get_indexes(table_name)]
+    
     def check_database_structure(self) -> Dict[str, Any]:
         """
         Verifica a estrutura atual do banco de dados.
@@ -53,6 +79,8 @@ class DBMigrationManager:
             'tables': {},
             'missing_tables': [],
             'missing_columns': {},
+            'missing_indexes': {},
+            'converted_columns': {},
             'needs_migration': False
         }
         
@@ -81,6 +109,33 @@ class DBMigrationManager:
                     result['missing_columns'][table_name] = missing_columns
                     result['needs_migration'] = True
                 
+                # Verificar índices
+                existing_indexes = self.get_table_indexes(table_name)
+                missing_indexes = [
+                    index.name for index in Base.metadata.tables[table_name].indexes
+                    if index.name not in existing_indexes
+                ]
+                
+                if missing_indexes:
+                    result['missing_indexes'][table_name] = missing_indexes
+                    result['needs_migration'] = True
+                
+                # Verificar colunas com tipo alterado (apenas PostgreSQL suporta ALTER COLUMN TYPE)
+                if engine.dialect.name == 'postgresql':
+                    converted_columns = []
+                    for col_name in self.CONVERTED_COLUMNS.get(table_name, {}):
+                        if col_name not in existing_columns:
+                            continue
+                        
+                        expected_type = expected_columns[col_name].type.compile(dialect=engine.dialect)
+                        existing_type = existing_columns[col_name]['type'].compile(dialect=engine.dialect)
+                        if expected_type != existing_type:
+                            converted_columns.append(col_name)
+                    
+                    if converted_columns:
+                        result['converted_columns'][table_name] = converted_columns
+                        result['needs_migration'] = True
+                
                 # Adicionar informações da tabela
                 result['tables'][table_name] = {
                     'existing_columns': list(existing_columns.keys()),
@@ -101,6 +156,7 @@ class DBMigrationManager:
             'success': False,
             'created_tables': [],
             'altered_tables': [],
+            'created_indexes': [],
             'errors': []
         }
         
@@ -160,6 +216,43 @@ class DBMigrationManager:
                     result['errors'].append(error_msg)
                     logger.error(error_msg)
             
+            # Converter colunas com tipo alterado
+            for table_name, converted_columns in check_result['converted_columns'].items():
+                try:
+                    table = Base.metadata.tables[table_name]
+                    
+                    with engine.begin() as conn:
+                        for col_name in converted_columns:
+                            type_sql = str(table.columns[col_name].type.compile(dialect=engine.dialect))
+                            using = self.CONVERTED_COLUMNS[table_name][col_name]
+                            
+                            sql = f"ALTER TABLE {table_name} ALTER COLUMN {col_name} TYPE {type_sql} USING {using}"
+                            conn.execute(text(sql))
+                            logger.info(f"Coluna {col_name} da tabela {table_name} convertida para {type_sql}")
+                    
+                    result['altered_tables'].append(table_name)
+                except Exception as e:
+                    error_msg = f"Erro ao converter colunas da tabela {table_name}: {str(e)}"
+                    result['errors'].append(error_msg)
+                    logger.error(error_msg)
+            
+            # Criar índices faltantes
+            for table_name, missing_indexes in check_result['missing_indexes'].items():
+                table = Base.metadata.tables[table_name]
+                
+                for index in table.indexes:
+                    if index.name not in missing_indexes:
+                        continue
+                    
+                    try:
+                        index.create(engine)
+                        result['created_indexes'].append(index.name)
+                        logger.info(f"Índice {index.name} criado na tabela {table_name}")
+                    except Exception as e:
+                        error_msg = f"Erro ao criar índice {index.name}: {str(e)}"
+                        result['errors'].append(error_msg)
+                        logger.error(error_msg)
+            
             # Atualizar dados se necessário (migração de dados específica)
             self._migrate_data()
             
@@ -178,6 +271,15 @@ class DBMigrationManager:
         Esta função pode ser expandida para migrações futuras.
         """
         try:
+            with get_db_session() as session:
+                # Execuções anteriores à coluna started_at: usar a data de criação como início
+                session.execute(text(
+                    "UPDATE tasks SET started_at = created_at WHERE status = 'running' AND started_at IS NULL"
+                ))
+                # O índice (status, created_at) foi substituído por (status, started_at)
+                session.execute(text("DROP INDEX IF EXISTS ix_task_status_created_at"))
+                session.commit()
+            
             # Exemplo: migrar configurações do navegador
             with get_db_session() as session:
                 # Verificar se existem configurações antigas
@@ -3,13 +3,15 @@ import datetime
 import pytz
 import os
 import base64
+from functools import lru_cache
 
 def generate_unique_id():
     """Gera um ID único para tarefas"""
     return uuid.uuid4().hex
 
+@lru_cache(maxsize=4096)
 def format_datetime(dt, format_str="%d/%m/%Y %H:%M:%S"):
-    """Formata um objeto datetime para exibição"""
+    """Formata um objeto datetime para exibição (memoizado, pois as datas das tarefas não mudam)"""
     if not dt:
         return "-"
     
@@ -27,58 +29,61 @@ def format_datetime(dt, format_str="%d/%m/%Y %H:%M:%S"):
     
     return dt.strftime(format_str)
 
+# Cores CSS por status da tarefa
+STATUS_COLORS = {
+    'created': '#3498db',  # Azul
+    'running': '#f39c12',  # Laranja
+    'finished': '#2ecc71',  # Verde
+    'failed': '#e74c3c'    # Vermelho
+}
+
 def get_status_color(status):
     """Retorna uma cor CSS baseada no status da tarefa"""
-    colors = {
-        'created': '#3498db',  # Azul
-        'running': '#f39c12',  # Laranja
-        'finished': '#2ecc71',  # Verde
-        'failed': '#e74c3c'    # Vermelho
-    }
-    return colors.get(status, '#95a5a6')  # Cinza como padrão
+    return STATUS_COLORS.get(status, '#95a5a6')  # Cinza como padrão
+
+# Modelos disponíveis por provedor de LLM (tuplas imutáveis montadas uma única vez na importação)
+LLM_MODELS = {
+    'openai': (
+        'gpt-4o',
+        'gpt-4-turbo',
+        'gpt-4-vision',
+        'gpt-4',
+        'gpt-3.5-turbo'
+    ),
+    'anthropic': (
+        'claude-3-opus-20240229',
+        'claude-3-sonnet-20240229',
+        'claude-3-haiku-20240307',
+        'claude-2.1',
+        'claude-2.0',
+        'claude-instant-1.2'
+    ),
+    'azure': (
+        'gpt-4',
+        'gpt-4-32k',
+        'gpt-35-turbo',
+        'gpt-35-turbo-16k'
+    ),
+    'gemini': (
+        'gemini-pro',
+        'gemini-ultra'
+    ),
+    'deepseek': (
+        'deepseek-chat',
+        'deepseek-coder'
+    ),
+    'ollama': (
+        'llama2',
+        'llama3',
+        'mistral',
+        'mixtral',
+        'phi'
+    )
+}
 
 def get_llm_models(provider):
     """Retorna os modelos disponíveis para um determinado provedor de LLM"""
-    models = {
-        'openai': [
-            'gpt-4o',
-            'gpt-4-turbo',
-            'gpt-4-vision',
-            'gpt-4',
-            'gpt-3.5-turbo'
-        ],
-        'anthropic': [
-            'claude-3-opus-20240229',
-            'claude-3-sonnet-20240229',
-            'claude-3-haiku-20240307',
-            'claude-2.1',
-            'claude-2.0',
-            'claude-instant-1.2'
-        ],
-        'azure': [
-            'gpt-4',
-            'gpt-4-32k',
-            'gpt-35-turbo',
-            'gpt-35-turbo-16k'
-        ],
-        'gemini': [
-            'gemini-pro',
-            'gemini-ultra'
-        ],
-        'deepseek': [
-            'deepseek-chat',
-            'deepseek-coder'
-        ],
-        'ollama': [
-            'llama2',
-            'llama3',
-            'mistral',
-            'mixtral',
-            'phi'
-        ]
-    }
-    
-    return models.get(provider, ['default-model'])
+    return LLM_MODELS.get(provider, ('default-model',))
 
 def ensure_directory_exists(directory_path):
     """Garante que o diretório existe, criando-o se necessário"""
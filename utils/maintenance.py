@@ -2,8 +2,9 @@ import os
 import logging
 import shutil
 from datetime import datetime, timedelta
-from typing import List, Optional
-import json
+from typing import Dict, List, Optional
+
+from sqlalchemy import update
 
 # Importações internas
 from db.database import get_db_session
@@ -66,6 +67,36 @@ class MaintenanceManager:
             logger.error(f"Erro ao limpar tarefas antigas: {e}")
             return 0
     
+    def reset_stuck_tasks(self, minutes: int = 30) -> int:
+        """
+        Devolve para 'created' as tarefas presas em 'running' (ex.: processo reiniciado durante a execução).
+        
+        Args:
+            minutes: Tempo máximo em minutos para uma tarefa permanecer em 'running'
+            
+        Returns:
+            Número de tarefas liberadas
+        """
+        cutoff_date = datetime.now() - timedelta(minutes=minutes)
+        
+        try:
+            with get_db_session() as session:
+                # Um único UPDATE filtrado pelo índice (status, started_at)
+                result = session.execute(
+                    update(Task)
+                    .where(Task.status == 'running', Task.started_at < cutoff_date)
+                    .values(status='created')
+                )
+                session.commit()
+                
+                if result.rowcount:
+                    logger.info(f"Liberadas {result.rowcount} tarefas presas em execução")
+                return result.rowcount
+        
+        except Exception as e:
+            logger.error(f"Erro ao liberar tarefas presas: {e}")
+            return 0
+    
     def clean_old_screenshots(self, days: Optional[int] = None) -> int:
         """
         Remove screenshots antigos que não estão mais vinculados a tarefas.
@@ -94,11 +125,7 @@ class MaintenanceManager:
                 
                 for history in histories:
                     if history.screenshots:
-                        try:
-                            screenshots = json.loads(history.screenshots)
-                            used_screenshots.extend(screenshots)
-                        except:
-                            pass
+                        used_screenshots.extend(history.screenshots)
             
             # Listar todos os arquivos no diretório
             all_files = []
@@ -172,11 +199,15 @@ class MaintenanceManager:
             Dicionário com resultados das operações
         """
         results = {
+            'stuck_tasks_reset': 0,
             'tasks_removed': 0,
             'screenshots_removed': 0,
             'backup_created': 0
         }
         
+        # Liberar tarefas presas em execução
+        results['stuck_tasks_reset'] = self.reset_stuck_tasks()
+        
         # Limpar tarefas antigas
         results['tasks_removed'] = self.clean_old_tasks()
         
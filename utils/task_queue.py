@@ -0,0 +1,52 @@
+import os
+import asyncio
+import logging
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# URL do broker (Redis). Sem ela as tarefas continuam sendo executadas no próprio processo do Streamlit
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL')
+
+celery_app = None
+if CELERY_BROKER_URL:
+    try:
+        from celery import Celery
+
+        celery_app = Celery('agents', broker=CELERY_BROKER_URL)
+        celery_app.conf.update(
+            task_acks_late=True,
+            worker_prefetch_multiplier=1
+        )
+    except ImportError:
+        logger.warning("CELERY_BROKER_URL definido, mas o Celery não está instalado. Usando execução local.")
+
+def is_enabled() -> bool:
+    """Indica se as tarefas devem ser enviadas para os workers do Celery"""
+    return celery_app is not None
+
+if celery_app is not None:
+    @celery_app.task(bind=True, name='agents.run_agent_task', max_retries=3, default_retry_delay=60)
+    def run_agent_celery(self, task_id: str):
+        """Executa uma tarefa do agente em um worker do Celery (parâmetros lidos da própria tarefa)"""
+        from utils.task_runner import execute_task_async, fail_task, TaskStartError
+
+        try:
+            return asyncio.run(execute_task_async(task_id))
+        except TaskStartError as e:
+            # O agente ainda não começou: repetir é seguro
+            if self.request.retries < self.max_retries:
+                logger.warning("Falha ao preparar tarefa %s, nova tentativa: %s", task_id, e)
+                raise self.retry(exc=e)
+            logger.error("Falha ao preparar tarefa %s após %s tentativas: %s", task_id, self.max_retries, e)
+            fail_task(task_id, e)
+        except Exception as e:
+            # Falha após o início do agente (ex.: ao gravar o resultado): não reexecutar a navegação
+            logger.exception("Erro ao executar tarefa %s no worker", task_id)
+            fail_task(task_id, e)
+
+def enqueue_task(task_id: str):
+    """Envia para a fila do Celery uma tarefa já marcada como 'running' (apenas o ID passa pelo broker)"""
+    logger.info("Enviando tarefa %s para a fila", task_id)
+    return run_agent_celery.delay(task_id)
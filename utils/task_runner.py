@@ -0,0 +1,235 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from sqlalchemy import update, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+# Importações internas
+from db.database import get_db_session
+from db.models import Task, TaskHistory, ApiKey
+from utils.sensitive_data import sensitive_data_manager
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Gravação do resultado montada uma única vez e reaproveitada por todas as tarefas
+# (os dados sensíveis criptografados são descartados ao final da execução)
+_FINISH_TASK = (
+    update(Task)
+    .where(Task.id == bindparam('task_id_param'))
+    .values(
+        status=bindparam('new_status'),
+        finished_at=bindparam('new_finished_at'),
+        output=bindparam('new_output'),
+        sensitive_data=None
+    )
+)
+
+class TaskStartError(Exception):
+    """Falha ocorrida antes do início do agente (pode ser repetida sem reexecutar a navegação)"""
+
+def upsert_rows(session, model, rows, key_column):
+    """Insere ou atualiza linhas com uma única instrução de upsert conforme o dialeto"""
+    dialect = session.get_bind().dialect.name
+    update_columns = [column for column in rows[0] if column != key_column]
+
+    if dialect in ('postgresql', 'sqlite'):
+        # INSERT ... ON CONFLICT (chave) DO UPDATE
+        insert = pg_insert if dialect == 'postgresql' else sqlite_insert
+        stmt = insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key_column],
+            set_={column: stmt.excluded[column] for column in update_columns}
+        )
+        session.execute(stmt)
+    elif dialect == 'mysql':
+        # INSERT ... ON DUPLICATE KEY UPDATE
+        stmt = mysql_insert(model).values(rows)
+        stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update_columns})
+        session.execute(stmt)
+    else:
+        # Carregar as linhas existentes de uma vez para que o merge não faça um SELECT por chave
+        keys = [row[key_column] for row in rows]
+        session.query(model).filter(getattr(model, key_column).in_(keys)).all()
+        for row in rows:
+            session.merge(model(**row))
+
+def store_execution_params(task_id: str, browser_config: Dict[str, Any],
+                           sensitive_data: Optional[Dict[str, str]] = None):
+    """Grava na tarefa a configuração do navegador e os dados sensíveis criptografados, para os workers"""
+    with get_db_session() as session:
+        session.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(
+                config=json.dumps(browser_config, separators=(',', ':')),
+                sensitive_data=sensitive_data_manager.store_sensitive_data(task_id, sensitive_data) or None
+            )
+        )
+        session.commit()
+
+def load_task(task_id: str):
+    """Carrega apenas os campos da tarefa usados na execução (tupla desvinculada da sessão)"""
+    with get_db_session() as session:
+        return session.query(
+            Task.task,
+            Task.llm_provider,
+            Task.llm_model,
+            Task.created_at,
+            Task.config,
+            Task.sensitive_data
+        ).filter(Task.id == task_id).first()
+
+def load_llm_api_keys(provider: str) -> Dict[str, str]:
+    """Carrega apenas as chaves de API necessárias para o provedor da tarefa"""
+    with get_db_session() as session:
+        return dict(
+            session.query(ApiKey.provider, ApiKey.api_key)
+            .filter(ApiKey.provider.in_([provider, 'azure_endpoint']))
+            .all()
+        )
+
+def save_task_result(task_id: str, status: str, output: str, history_row: Optional[Dict[str, Any]] = None) -> bool:
+    """Grava o resultado e o histórico da tarefa; retorna False se a tarefa não existir mais"""
+    # Atualizar a tarefa e criar ou atualizar o histórico sem recarregar as linhas
+    with get_db_session() as session:
+        updated = session.execute(_FINISH_TASK, {
+            'task_id_param': task_id,
+            'new_status': status,
+            'new_finished_at': datetime.now(),
+            'new_output': output
+        })
+
+        if updated.rowcount == 0:
+            return False
+
+        if history_row is not None:
+            upsert_rows(session, TaskHistory, [history_row], 'task_id')
+        session.commit()
+    return True
+
+def fail_task(task_id: str, error: Exception):
+    """Marca a tarefa como 'failed' após um erro fora da execução do agente"""
+    try:
+        save_task_result(task_id, 'failed', f"Erro na execução: {str(error)}")
+    except Exception:
+        logger.exception("Erro ao marcar tarefa %s como falha", task_id)
+
+async def _prepare_execution(task_id, browser_config, sensitive_data):
+    """Carrega a tarefa, as chaves de API e os parâmetros de execução; erros aqui não iniciaram o agente"""
+    # O acesso ao banco é síncrono e roda em threads, para não bloquear as outras tarefas do event loop
+    try:
+        task = await asyncio.to_thread(load_task, task_id)
+        if not task:
+            return None, None, None, None
+
+        api_keys = await asyncio.to_thread(load_llm_api_keys, task.llm_provider)
+
+        # Execução em um worker: parâmetros gravados na tarefa por store_execution_params
+        if browser_config is None:
+            browser_config = json.loads(task.config) if task.config else {}
+            sensitive_data = sensitive_data_manager.load_sensitive_data(task.sensitive_data)
+    except Exception as e:
+        raise TaskStartError(str(e)) from e
+
+    if task.llm_provider == 'azure':
+        llm_info = {
+            'provider': task.llm_provider,
+            'model': task.llm_model,
+            'api_key': api_keys.get('azure', ''),
+            'endpoint': api_keys.get('azure_endpoint', '')
+        }
+    else:
+        llm_info = {
+            'provider': task.llm_provider,
+            'model': task.llm_model,
+            'api_key': api_keys.get(task.llm_provider, '')
+        }
+
+    return task, llm_info, browser_config, sensitive_data
+
+async def execute_task_async(task_id: str, browser_config: Optional[Dict[str, Any]] = None,
+                             sensitive_data: Optional[Dict[str, str]] = None):
+    """Executa uma tarefa específica assincronamente (já reivindicada por claim_task)
+
+    Sem browser_config, os parâmetros são lidos da tarefa (gravados por store_execution_params).
+    Levanta TaskStartError se a falha ocorrer antes do início do agente.
+    """
+    logger.info("Executando tarefa %s assincronamente", task_id)
+
+    task, llm_info, browser_config, sensitive_data = await _prepare_execution(task_id, browser_config, sensitive_data)
+
+    if not task:
+        logger.error("Tarefa %s não encontrada", task_id)
+        return {"error": "Tarefa não encontrada"}
+
+    task_created_at = task.created_at
+    sensitive_data = sensitive_data or {}
+
+    # Forçar visualização se solicitado
+    browser_config = dict(browser_config)
+    if not browser_config.get('headless', False) or browser_config.get('show_browser', True):
+        browser_config['headless'] = False
+        browser_config['show_browser'] = True
+        logger.info("Configurado para mostrar o navegador durante a execução")
+
+    try:
+        logger.info("Executando agente para tarefa %s", task_id)
+        # Executar o agente (importação tardia: o executor do agente só é necessário ao executar tarefas)
+        from utils.agent_runner import run_agent_task
+        result = await run_agent_task(
+            task_id=task_id,
+            task_instructions=task.task,
+            llm=llm_info,
+            browser_config=browser_config,
+            sensitive_data=sensitive_data
+        )
+    except Exception as e:
+        logger.exception("Erro durante execução da tarefa %s", task_id)
+        result = None
+        error = e
+
+    # Sucesso e falha compartilham uma única gravação no banco de dados
+    if result is None:
+        status = 'failed'
+        output = f"Erro na execução: {str(error)}"
+        history_row = None
+    else:
+        # Definir status correto
+        status = result.get('status', 'unknown')
+        if status not in ['created', 'running', 'finished', 'failed']:
+            status = 'finished' if not result.get('errors') else 'failed'
+        output = result.get('output', '')
+
+        # Colunas JSON nativas: as listas são gravadas diretamente
+        history_row = {
+            'task_id': task_id,
+            'steps': result.get('steps', []),
+            'urls': result.get('urls', []),
+            'screenshots': result.get('screenshots', []),
+            'errors': result.get('errors', [])
+        }
+
+        # Calcular duração total
+        if task_created_at:
+            history_row['duration'] = int((datetime.now() - task_created_at).total_seconds())
+
+    if not await asyncio.to_thread(save_task_result, task_id, status, output, history_row):
+        logger.error("Tarefa %s não encontrada após execução", task_id)
+        return {"error": "Tarefa não encontrada após execução"}
+
+    if result is None:
+        return {
+            "status": "failed",
+            "error": str(error),
+            "errors": [str(error)]
+        }
+
+    logger.info("Tarefa %s concluída com status: %s", task_id, status)
+    return result